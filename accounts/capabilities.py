@@ -0,0 +1,115 @@
+from django.contrib.auth import SESSION_KEY
+
+# Members of this group may add campsites and modify the ones they created
+CAMPSITE_MANAGER_GROUP = 'CampsiteManager'
+
+# Session entry holding the user's group names and the capabilities_version they were read at
+CAPABILITIES_SESSION_KEY = '_capabilities'
+
+
+class Capabilities:
+    """
+    What a user may do, resolved once per request by get_capabilities().
+
+    Role flags come from the user row the auth middleware already loaded;
+    group membership is the only part that needs a query, and it is cached
+    in the session until the user's capabilities_version changes.
+    """
+
+    def __init__(self, user, group_names=()):
+        self.user_id = user.pk
+        self.is_authenticated = user.is_authenticated
+        self.is_staff = user.is_staff
+        self.is_superuser = user.is_superuser
+        self.is_super_admin = user.is_authenticated and user.is_super_admin
+        self.groups = frozenset(group_names)
+
+    @property
+    def is_campsite_manager(self):
+        return CAMPSITE_MANAGER_GROUP in self.groups
+
+    @property
+    def can_add_campsites(self):
+        """Superusers and CampsiteManagers can add campsites."""
+        return self.is_superuser or self.is_campsite_manager
+
+    def can_modify_campsite(self, campsite):
+        """Superusers can modify any campsite, CampsiteManagers only the ones they created."""
+        return self.is_superuser or (self.is_campsite_manager and campsite.created_by_id == self.user_id)
+
+    @property
+    def can_manage_products(self):
+        """Products are created, edited and deleted by super admins only."""
+        return self.is_super_admin
+
+    def __repr__(self):
+        return f"<Capabilities user={self.user_id} groups={sorted(self.groups)}>"
+
+
+def _user_session(request, user):
+    """The request's session if it belongs to user, else None (e.g. token-authenticated API calls)."""
+    session = getattr(request, 'session', None)
+    if session is None or session.get(SESSION_KEY) != str(user.pk):
+        return None
+    return session
+
+
+def _session_groups(session, user):
+    """Group names cached in the session, or None if missing or stale."""
+    if session is None:
+        return None
+    cached = session.get(CAPABILITIES_SESSION_KEY)
+    if cached and cached.get('version') == user.capabilities_version:
+        return cached['groups']
+    return None
+
+
+def _store_session_groups(session, user, group_names):
+    if session is not None:
+        session[CAPABILITIES_SESSION_KEY] = {'version': user.capabilities_version, 'groups': group_names}
+
+
+def _cached_capabilities(request, user):
+    capabilities = getattr(request, '_capabilities', None)
+    if capabilities is not None and capabilities.user_id == user.pk:
+        return capabilities
+    return None
+
+
+def get_capabilities(request):
+    """Return the Capabilities of request.user, querying its groups at most once per session."""
+    user = request.user
+    capabilities = _cached_capabilities(request, user)
+    if capabilities is not None:
+        return capabilities
+
+    group_names = []
+    if user.is_authenticated:
+        session = _user_session(request, user)
+        group_names = _session_groups(session, user)
+        if group_names is None:
+            group_names = list(user.groups.values_list('name', flat=True))
+            _store_session_groups(session, user, group_names)
+
+    capabilities = request._capabilities = Capabilities(user, group_names)
+    return capabilities
+
+
+async def aget_capabilities(request):
+    """Async version of get_capabilities()."""
+    user = await request.auser()
+    capabilities = _cached_capabilities(request, user)
+    if capabilities is not None:
+        return capabilities
+
+    group_names = []
+    if user.is_authenticated:
+        # auser() has already loaded the session, so reading it here doesn't query
+        session = _user_session(request, user)
+        group_names = _session_groups(session, user)
+        if group_names is None:
+            group_names = [name async for name in user.groups.values_list('name', flat=True)]
+            _store_session_groups(session, user, group_names)
+
+    capabilities = request._capabilities = Capabilities(user, group_names)
+    return capabilities
@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from .capabilities import get_capabilities
+
+
+def capabilities(request):
+    """
+    Expose the user's Capabilities to templates as {{ capabilities }}.
+
+    Resolved lazily, so templates that don't use it cost nothing; async
+    views resolve it with aget_capabilities() before rendering.
+    """
+    resolved = getattr(request, '_capabilities', None)
+    return {'capabilities': resolved or SimpleLazyObject(lambda: get_capabilities(request))}
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='capabilities_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Bumped when the user's groups change, invalidating capabilities cached in their sessions"),
+        ),
+    ]
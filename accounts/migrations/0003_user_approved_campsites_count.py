@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_capabilities_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='approved_campsites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of approved campsites suggested by this user, maintained as suggestions are approved, unapproved or deleted'),
+        ),
+    ]
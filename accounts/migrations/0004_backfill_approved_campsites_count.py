@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill_approved_campsites_counts(apps, schema_editor):
+    """Count the approved campsites each user has suggested."""
+    Campsite = apps.get_model("core", "Campsite")
+    User = apps.get_model("accounts", "User")
+    counts = (
+        Campsite.objects.filter(is_approved=True, suggested_by__isnull=False)
+        .order_by()
+        .values_list("suggested_by")
+        .annotate(total=Count("pk"))
+    )
+    for user_id, total in counts:
+        User.objects.filter(pk=user_id).update(approved_campsites_count=total)
+
+
+def clear_approved_campsites_counts(apps, schema_editor):
+    """Reverse operation - no-op as the counters are rebuilt from the campsites on the way forward."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_approved_campsites_count'),
+        ('core', '0023_campsite_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_approved_campsites_counts, clear_approved_campsites_counts),
+    ]
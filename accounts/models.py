@@ -9,18 +9,32 @@ class User(AbstractUser):
         USER = "user", "User"
 
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.USER)
+    capabilities_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bumped when the user's groups change, invalidating capabilities cached in their sessions"
+    )
+    approved_campsites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of approved campsites suggested by this user, maintained as suggestions are approved, unapproved or deleted"
+    )
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            # capabilities_version is bumped by the group signals and
+            # approved_campsites_count moved by campsite approvals, both with
+            # F() updates that a stale instance must not overwrite
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in ('capabilities_version', 'approved_campsites_count')
+            ]
+        super().save(*args, **kwargs)
 
     @property
     def is_super_admin(self):
         return self.role == self.Role.SUPER_ADMIN or self.is_superuser
     
-    @property
-    def approved_campsites_count(self):
-        """Count of approved campsites suggested by this user."""
-        from django.apps import apps
-        Campsite = apps.get_model("core", "Campsite")
-        return Campsite.objects.filter(suggested_by=self, is_approved=True).count()
-    
     @property
     def can_auto_approve_campsites(self):
         """Returns True if user has 3 or more approved campsite suggestions."""
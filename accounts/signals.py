@@ -0,0 +1,34 @@
+from django.contrib.auth.models import Group
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import User
+
+
+def bump_capabilities_version(user_ids):
+    """Invalidate the capabilities cached in these users' sessions."""
+    User.objects.filter(pk__in=user_ids).update(capabilities_version=F('capabilities_version') + 1)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_capabilities_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump the version of every user whose groups changed, from either side of the relation."""
+    if not reverse:
+        # user.groups.add/remove/clear/set()
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_capabilities_version([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        # group.user_set.add/remove()
+        bump_capabilities_version(pk_set)
+    elif action == 'pre_clear':
+        # group.user_set.clear(); the members are gone by post_clear
+        bump_capabilities_version(instance.user_set.values('pk'))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_capabilities_on_group_change(sender, instance, created=False, **kwargs):
+    """Capabilities are derived from group names, so renaming or deleting a group affects its members."""
+    if not created:
+        bump_capabilities_version(instance.user_set.values('pk'))
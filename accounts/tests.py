@@ -1,3 +1,47 @@
+from django.contrib.auth.models import Group
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import Campsite
+
+from .models import User
+
+
+class UserSaveTests(TestCase):
+    """A full user.save() leaves the counters maintained by UPDATE expressions alone."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='suggester', password='x')
+
+    def test_approval_survives_save_of_stale_instance(self):
+        campsite = Campsite.objects.create(
+            name='Camping Test', town='Testville', description='A campsite for the tests.',
+            map_location='41.3851, 2.1734', country='ES', suggested_by=self.user,
+        )
+        stale = User.objects.get(pk=self.user.pk)
+
+        # Approved from another request while this one holds the old row
+        campsite.is_approved = True
+        campsite.save()
+
+        stale.first_name = 'Renamed'
+        stale.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Renamed')
+        self.assertEqual(self.user.approved_campsites_count, 1)
+
+    def test_group_change_survives_save_of_stale_instance(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.user.groups.add(Group.objects.create(name='CampsiteManager'))
+
+        stale.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.capabilities_version, 1)
+
+    def test_create_writes_every_field(self):
+        user = User(username='fresh', approved_campsites_count=2)
+        user.save()
+
+        user.refresh_from_db()
+        self.assertEqual(user.approved_campsites_count, 2)
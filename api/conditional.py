@@ -0,0 +1,58 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified while the client's copy is current.
+
+    Views implement get_validators() with a cheap query (an indexed MAX()
+    rather than the page itself), so a matching If-None-Match or
+    If-Modified-Since skips the main query and serialization entirely. The ETag also covers everything else the body depends on: the
+    user, the query parameters and the negotiated renderer.
+    """
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Return (version_parts, last_modified) for the current request.
+
+        version_parts is a sequence hashed into the ETag, or None to skip the
+        ETag; last_modified is an aware datetime or None.
+        """
+        raise NotImplementedError
+
+    def get_variant(self, request):
+        """The parts of the request, besides the data version, that shape the response body."""
+        return (
+            request.user.pk,
+            sorted(request.query_params.lists()),
+            request.accepted_renderer.media_type,
+        )
+
+    def get(self, request, *args, **kwargs):
+        version_parts, last_modified = self.get_validators(request, *args, **kwargs)
+
+        etag = None
+        if version_parts is not None:
+            parts = (*version_parts, *self.get_variant(request))
+            raw = '|'.join(str(part) for part in parts).encode('utf-8')
+            etag = quote_etag(hashlib.md5(raw, usedforsecurity=False).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if etag:
+                response.headers['ETag'] = etag
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+
+        # Browsers may keep the body but must revalidate it before reuse, and
+        # the body depends on who is asking (visibility, like state) and on the
+        # negotiated format
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Accept', 'Cookie', 'Authorization'))
+        return response
@@ -0,0 +1,12 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    Plain JSON, selected with ?format=compact.
+
+    Views that offer it check request.accepted_renderer.format and return
+    column-oriented results ({"id": [...], "name": [...]}) instead of a list
+    of objects; the renderer itself only registers the format name.
+    """
+    format = 'compact'
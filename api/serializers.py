@@ -34,6 +34,61 @@ class CampsiteSerializer(serializers.ModelSerializer):
         return getattr(obj, 'has_liked', False)
 
 
+# Fields the list API can return (see ?fields=), in CampsiteSerializer order
+CAMPSITE_LIST_FIELDS = tuple(CampsiteSerializer.Meta.fields)
+# Columns each derived field is computed from; other fields map to their own column
+DERIVED_FIELD_COLUMNS = {
+    'country_name': ('country',),
+    'has_liked': (),
+}
+COUNTRY_NAMES = {code: str(name) for code, name in Campsite.COUNTRY_CHOICES}
+
+
+def campsite_list_columns(fields):
+    """Return the database columns needed to serialize the given list fields."""
+    columns = []
+    for field in fields:
+        for column in DERIVED_FIELD_COLUMNS.get(field, (field,)):
+            if column not in columns:
+                columns.append(column)
+    return tuple(columns)
+
+
+# Columns read by serialize_campsite_rows for the full field set
+CAMPSITE_LIST_COLUMNS = campsite_list_columns(CAMPSITE_LIST_FIELDS)
+
+
+def serialize_campsite_rows(rows, fields=CAMPSITE_LIST_FIELDS):
+    """
+    Serialize campsite values() rows to the same dicts as CampsiteSerializer.
+
+    Used on the list API's hot path, where building model instances and
+    running per-field serializers dominates the response time. Only the
+    given fields are emitted. has_liked is always False here; callers
+    overlay the user's like state.
+    """
+    results = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            if field == 'country_name':
+                item[field] = COUNTRY_NAMES.get(row['country'], row['country'])
+            elif field == 'has_liked':
+                item[field] = False
+            else:
+                item[field] = row[field]
+        results.append(item)
+    return results
+
+
+class NearbyCampsiteSerializer(CampsiteSerializer):
+    """Campsite serializer for proximity results, including the distance from the origin."""
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(CampsiteSerializer.Meta):
+        fields = CampsiteSerializer.Meta.fields + ['distance_km']
+
+
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
@@ -1,3 +1,203 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Max
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
-# Create your tests here.
+from core.models import Campsite, CampsiteLike, CampsiteTombstone
+from core.spatial import campsite_index
+
+from .serializers import CAMPSITE_LIST_COLUMNS, CampsiteSerializer, serialize_campsite_rows
+from .views import annotate_like_state, overlay_like_state
+
+User = get_user_model()
+
+
+def create_campsite(**kwargs):
+    fields = {
+        'name': 'Camping Test',
+        'town': 'Testville',
+        'description': 'A campsite for the tests.',
+        'map_location': '41.3851, 2.1734',
+        'country': 'ES',
+        'is_approved': True,
+    }
+    fields.update(kwargs)
+    return Campsite.objects.create(**fields)
+
+
+class SerializeCampsiteRowsTests(TestCase):
+    """serialize_campsite_rows() renders the same JSON as CampsiteSerializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='liker', password='x')
+        other = User.objects.create_user(username='other', password='x')
+        # Null image_url and blank type/province next to fully filled rows
+        bare = create_campsite(name='Bare', image_url=None, type='', province='', website='', phone_number='')
+        full = create_campsite(
+            name='Full', country='FR', image_url='https://ik.example/full.jpg', type='BEACH',
+            province='Brittany', website='https://full.example', phone_number='+33 1 23', is_premium=True,
+        )
+        create_campsite(name='Pending', country='DE', is_approved=False)
+        CampsiteLike.objects.create(user=cls.user, campsite=full)
+        CampsiteLike.objects.create(user=other, campsite=full)
+        CampsiteLike.objects.create(user=other, campsite=bare)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def serializer_output(self, user):
+        campsites = annotate_like_state(Campsite.objects.order_by('pk'), user)
+        return CampsiteSerializer(campsites, many=True).data
+
+    def rows_output(self, user):
+        rows = Campsite.objects.order_by('pk').values(*CAMPSITE_LIST_COLUMNS)
+        return overlay_like_state(serialize_campsite_rows(rows), user)
+
+    def test_same_json_as_serializer(self):
+        self.assertEqual(self.render(self.rows_output(self.user)), self.render(self.serializer_output(self.user)))
+
+    def test_same_json_for_anonymous_user(self):
+        user = AnonymousUser()
+        self.assertEqual(self.render(self.rows_output(user)), self.render(self.serializer_output(user)))
+
+    def test_like_fields(self):
+        by_name = {item['name']: item for item in self.rows_output(self.user)}
+        self.assertEqual((by_name['Full']['like_count'], by_name['Full']['has_liked']), (2, True))
+        self.assertEqual((by_name['Bare']['like_count'], by_name['Bare']['has_liked']), (1, False))
+        self.assertIsNone(by_name['Bare']['image_url'])
+        self.assertEqual((by_name['Bare']['type'], by_name['Bare']['province']), ('', ''))
+
+    def test_field_subset_keeps_serializer_order(self):
+        fields = ('id', 'country_name', 'like_count')
+        rows = Campsite.objects.order_by('pk').values('id', 'country', 'like_count')
+        expected = [
+            {field: item[field] for field in fields}
+            for item in self.serializer_output(self.user)
+        ]
+        self.assertEqual(self.render(serialize_campsite_rows(rows, fields)), self.render(expected))
+
+
+class CampsiteChangesAPITests(TestCase):
+    """The delta sync feed returns what changed and what was deleted after a cursor."""
+
+    url = '/api/campsites/changes/'
+
+    def setUp(self):
+        # Sync versions are taken after commit, so let the on_commit callbacks run.
+        # The pending campsite comes first: the initial download's cursor stops at
+        # the last campsite it returned, and a later pending one would show up as
+        # deleted on the next call.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pending = create_campsite(name='Pending', is_approved=False)
+            self.kept = create_campsite(name='Kept')
+            self.edited = create_campsite(name='Edited')
+            self.removed = create_campsite(name='Removed')
+            self.unapproved = create_campsite(name='Unapproved')
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_initial_download_lists_approved_campsites(self):
+        feed = self.sync()
+        self.assertEqual(
+            [item['name'] for item in feed['changes']], ['Kept', 'Edited', 'Removed', 'Unapproved']
+        )
+        self.assertEqual(feed['deleted'], [])
+        self.assertFalse(feed['has_more'])
+        self.assertEqual(self.sync(feed['next_cursor']), {
+            'changes': [], 'deleted': [], 'next_cursor': feed['next_cursor'], 'has_more': False,
+        })
+
+    def test_changes_and_deletions_after_cursor(self):
+        cursor = self.sync()['next_cursor']
+        removed_pk, unapproved_pk = self.removed.pk, self.unapproved.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.edited.name = 'Edited again'
+            self.edited.save()
+            CampsiteLike.objects.create(user=User.objects.create_user(username='liker', password='x'), campsite=self.kept)
+            self.removed.delete()
+            self.unapproved.is_approved = False
+            self.unapproved.save()
+
+        feed = self.sync(cursor)
+        self.assertEqual(
+            [(item['name'], item['like_count']) for item in feed['changes']],
+            [('Edited again', 0), ('Kept', 1)],
+        )
+        # Deletions and campsites no longer visible to this user both tell the client to drop them
+        self.assertEqual(feed['deleted'], [removed_pk, unapproved_pk])
+        self.assertEqual(self.sync(feed['next_cursor'])['changes'], [])
+
+    def test_staff_get_unapproved_campsites_as_changes(self):
+        staff = User.objects.create_user(username='staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+        feed = self.sync()
+        self.assertIn('Pending', [item['name'] for item in feed['changes']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unapproved.is_approved = False
+            self.unapproved.save()
+        feed = self.sync(feed['next_cursor'])
+        self.assertEqual(([item['name'] for item in feed['changes']], feed['deleted']), (['Unapproved'], []))
+
+    def test_tombstone_records_the_deletion(self):
+        pk = self.removed.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.removed.delete()
+        tombstone = CampsiteTombstone.objects.get(campsite_id=pk)
+        self.assertGreater(tombstone.sync_version, Campsite.objects.aggregate(Max('sync_version'))['sync_version__max'])
+
+    def test_pages_follow_the_cursor(self):
+        cursor = self.sync()['next_cursor']
+        with self.captureOnCommitCallbacks(execute=True):
+            for campsite in (self.kept, self.edited):
+                campsite.save()
+            self.removed.delete()
+
+        first = self.sync(cursor, limit=2)
+        self.assertTrue(first['has_more'])
+        self.assertEqual([item['name'] for item in first['changes']], ['Kept', 'Edited'])
+        second = self.sync(first['next_cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual((second['changes'], len(second['deleted'])), ([], 1))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CampsiteMapAPITests(TestCase):
+    """Radius mode of the map data endpoint."""
+
+    url = '/api/campsites/map/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.center = create_campsite(name='Center', map_location='41.3851, 2.1734')
+        # About 5 km and 150 km away
+        create_campsite(name='Near', map_location='41.4300, 2.1734')
+        create_campsite(name='Far', map_location='42.7351, 2.1734')
+
+    def setUp(self):
+        # The spatial index is dropped on commit, which never happens inside a TestCase
+        campsite_index.invalidate()
+
+    def names(self, **params):
+        response = self.client.get(self.url, {'campsite_id': self.center.pk, **params})
+        self.assertEqual(response.status_code, 200)
+        return sorted(response.json()['markers']['name'])
+
+    def test_default_radius(self):
+        self.assertEqual(self.names(), ['Center', 'Near'])
+
+    def test_zero_radius_is_not_the_default(self):
+        self.assertEqual(self.names(radius_km=0), ['Center'])
+
+    def test_explicit_radius(self):
+        self.assertEqual(self.names(radius_km=200), ['Center', 'Far', 'Near'])
@@ -6,8 +6,16 @@ app_name = 'api'
 urlpatterns = [
     path('health/', views.health, name='health'),
     path('campsites/', views.CampsiteListAPIView.as_view(), name='campsite-list'),
-    path('campsites/<int:campsite_id>/like/', views.CampsiteLikeToggleView.as_view(), name='campsite-like-toggle'),
-    path('campsites/<int:campsite_id>/like-status/', views.CampsiteLikeStatusView.as_view(), name='campsite-like-status'),
+    path('campsites/export.ndjson', views.CampsiteExportView.as_view(), {'export_format': 'ndjson'}, name='campsite-export-ndjson'),
+    path('campsites/export.csv', views.CampsiteExportView.as_view(), {'export_format': 'csv'}, name='campsite-export-csv'),
+    path('campsites/facets/', views.CampsiteFacetsAPIView.as_view(), name='campsite-facets'),
+    path('campsites/changes/', views.CampsiteChangesAPIView.as_view(), name='campsite-changes'),
+    path('campsites/map/', views.CampsiteMapAPIView.as_view(), name='campsite-map'),
+    path('campsites/likes/status/', views.CampsiteLikeBulkStatusView.as_view(), name='campsite-like-status-bulk'),
+    path('campsites/nearby/', views.CampsiteNearbyAPIView.as_view(), name='campsite-nearby'),
+    path('campsites/<int:campsite_id>/nearby/', views.CampsiteNearbyAPIView.as_view(), name='campsite-nearby-campsite'),
+    path('campsites/<int:campsite_id>/like/', views.campsite_like_toggle, name='campsite-like-toggle'),
+    path('campsites/<int:campsite_id>/like-status/', views.campsite_like_status, name='campsite-like-status'),
     
     # Product API endpoints
     path('products/', views.ProductListAPIView.as_view(), name='api-product-list'),
@@ -1,35 +1,183 @@
-from django.db import transaction
-from django.db.models import Count, Exists, OuterRef, Q, Value, BooleanField
+import csv
+import json
+
+from django.db.models import Count, Exists, Max, OuterRef, Value, BooleanField
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated, BasePermission
+from django.views.decorators.http import require_POST, require_safe
+from rest_framework.permissions import AllowAny, BasePermission
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework import authentication, status, generics
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
-from core.models import Campsite, CampsiteLike, Product
-from .serializers import CampsiteSerializer, ProductSerializer
+from accounts.capabilities import get_capabilities
+from core.models import Campsite, CampsiteLike, CampsiteTombstone, Product
+from core.spatial import campsite_index
+from core.pagination import CAMPSITE_LIST_ORDERING, campsites_after, encode_campsite_cursor
+from core.clustering import MAX_CLUSTER_ZOOM, cluster_pyramid
+from core.search import search_campsites
+from core.caching import cached_catalogue
+from core.facets import count_facets, live_facet_rows, stored_facet_rows
+from core.likes import liked_campsite_ids, toggle_campsite_like
+from core.sync import decode_sync_cursor, encode_sync_cursor, latest_sync_version
+from .conditional import ConditionalGetMixin
+from .renderers import CompactJSONRenderer
+from .serializers import (
+    CAMPSITE_LIST_COLUMNS,
+    COUNTRY_NAMES,
+    CAMPSITE_LIST_FIELDS,
+    CampsiteSerializer,
+    NearbyCampsiteSerializer,
+    ProductSerializer,
+    campsite_list_columns,
+    serialize_campsite_rows,
+)
+
+
+@require_safe
+async def health(request):
+    return JsonResponse({"status": "ok"})
+
+
+def visible_campsites(user):
+    """Campsites the user may see: staff see all, others only approved."""
+    qs = Campsite.objects.all()
+    if not user.is_staff:
+        qs = qs.filter(is_approved=True)
+    return qs
+
+
+def campsite_filters(params):
+    """
+    Parse the list filters shared by the list and facets endpoints.
+
+    Returns a dict keyed by Campsite field: country is a list (?country=ES,FR),
+    type and province single values, is_premium a bool (from ?premium=).
+    """
+    filters = {}
+    countries = [code.strip().upper() for code in params.get('country', '').split(',') if code.strip()]
+    if countries:
+        filters['country'] = countries
+    campsite_type = params.get('type', '').strip()
+    if campsite_type:
+        filters['type'] = campsite_type.upper()
+    province = params.get('province', '').strip()
+    if province:
+        filters['province'] = province
+    premium = params.get('premium', '').strip().lower()
+    if premium:
+        if premium not in ('true', 'false', '1', '0'):
+            raise ValidationError({'premium': 'Must be true or false.'})
+        filters['is_premium'] = premium in ('true', '1')
+    return filters
+
+
+def filter_campsites(qs, filters):
+    """Apply campsite_filters() to a queryset; each filter has a matching listing index."""
+    if 'country' in filters:
+        qs = qs.filter(country__in=filters['country'])
+    if 'type' in filters:
+        qs = qs.filter(type=filters['type'])
+    if 'province' in filters:
+        qs = qs.filter(province__iexact=filters['province'])
+    if 'is_premium' in filters:
+        qs = qs.filter(is_premium=filters['is_premium'])
+    return qs
+
+
+def annotate_like_state(qs, user):
+    """Annotate a campsite queryset with the user's has_liked flag (like_count is a column)."""
+    # Annotate with has_liked for authenticated users
+    if user.is_authenticated:
+        qs = qs.annotate(
+            has_liked=Exists(
+                CampsiteLike.objects.filter(user=user, campsite_id=OuterRef('pk'))
+            )
+        )
+    else:
+        qs = qs.annotate(has_liked=Value(False, output_field=BooleanField()))
+
+    return qs
 
 
-@api_view(["GET"])
-@permission_classes([AllowAny])
-def health(request):
-    return Response({"status": "ok"})
+def overlay_like_state(results, user):
+    """Return copies of serialized campsites with has_liked set for the user, using one query."""
+    liked = liked_campsite_ids(user, [r['id'] for r in results])
+    return [{**r, 'has_liked': r['id'] in liked} for r in results]
 
 
 class CampsitePagination(PageNumberPagination):
     """Custom pagination for campsites list."""
     page_size = 30
     page_query_param = 'page'
+    # Disabled when the results are not in CAMPSITE_LIST_ORDERING
+    emit_cursor = True
 
     def get_paginated_response(self, data):
+        # Lets "Load more" continue in cursor mode from any numbered page
+        next_cursor = None
+        if self.emit_cursor and self.page.has_next():
+            next_cursor = encode_campsite_cursor(self.page.object_list[len(self.page.object_list) - 1])
+
         return Response({
             'count': self.page.paginator.count,
             'current_page': self.page.number,
             'total_pages': self.page.paginator.num_pages,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
+            'next_cursor': next_cursor,
+            'results': data,
+        })
+
+
+class CampsiteCursorPagination(BasePagination):
+    """
+    Keyset pagination over CAMPSITE_LIST_ORDERING for infinite scroll.
+
+    Each page continues from the (is_premium, like_count, name, id) of the
+    previous page's last row, so deep pages cost the same as the first and
+    no COUNT(*) runs unless the client asks for it with ?include_count=true.
+    """
+    page_size = 30
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                queryset = campsites_after(queryset, cursor)
+            except ValueError as e:
+                raise ValidationError({self.cursor_query_param: str(e)})
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_cursor = encode_campsite_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
             'results': data,
         })
 
@@ -37,101 +185,626 @@ class CampsitePagination(PageNumberPagination):
 @extend_schema(
     summary="List campsites (paginated)",
     parameters=[
-        OpenApiParameter(name='country', description='2-letter country code', required=False, type=OpenApiTypes.STR),
-        OpenApiParameter(name='search', description='Search in name or town', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='country', description='2-letter country code, or several separated by commas', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='type', description='Campsite type', required=False, type=OpenApiTypes.STR, enum=[code for code, _ in Campsite.TYPE_CHOICES]),
+        OpenApiParameter(name='province', description='Province, state or region (case-insensitive)', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='premium', description='Only premium (true) or only non-premium (false) campsites', required=False, type=OpenApiTypes.BOOL),
+        OpenApiParameter(name='search', description='Full-text search in name, town, province and description, with typo-tolerant matching on name and town', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='ordering', description="'relevance' to rank search results by match quality (page-number pagination only)", required=False, type=OpenApiTypes.STR, enum=['default', 'relevance']),
+        OpenApiParameter(name='fields', description=f"Comma-separated fields to return (id is always included). Available: {', '.join(CAMPSITE_LIST_FIELDS)}", required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='format', description="'compact' returns results as column arrays ({field: [values]}) instead of a list of objects", required=False, type=OpenApiTypes.STR, enum=['json', 'compact']),
         OpenApiParameter(name='page', description='Page number (1-based)', required=False, type=OpenApiTypes.INT),
+        OpenApiParameter(name='cursor', description='Keyset cursor from a previous next_cursor; switches to cursor pagination (pass it empty for the first page)', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='include_count', description='In cursor mode, also return the total count', required=False, type=OpenApiTypes.BOOL),
     ],
 )
-class CampsiteListAPIView(generics.ListAPIView):
+class CampsiteListAPIView(ConditionalGetMixin, generics.ListAPIView):
     """API view for paginated campsites list with filters."""
     serializer_class = CampsiteSerializer
     pagination_class = CampsitePagination
     permission_classes = [AllowAny]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when a cursor param is present, page numbers otherwise."""
+        if not hasattr(self, '_paginator'):
+            # The keyset cursor encodes the default ordering, so relevance-ranked
+            # results always use page numbers
+            if (CampsiteCursorPagination.cursor_query_param in self.request.query_params
+                    and not self.order_by_relevance()):
+                self._paginator = CampsiteCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+                self._paginator.emit_cursor = not self.order_by_relevance()
+        return self._paginator
 
     def get_queryset(self):
         request = self.request
         user = request.user
 
-        qs = Campsite.objects.all()
-
         # Approval visibility: staff can see all, others only approved
-        if not user.is_staff:
-            qs = qs.filter(is_approved=True)
+        qs = visible_campsites(user)
 
-        # Filter by country
-        country = request.query_params.get('country')
-        if country:
-            qs = qs.filter(country__iexact=country.strip())
+        # Filter by country, type, province and premium flag
+        qs = filter_campsites(qs, campsite_filters(request.query_params))
 
-        # Search in name or town
-        search = request.query_params.get('search')
+        # Full-text search with trigram fallback
+        search = self.search_text()
         if search:
-            s = search.strip()
-            qs = qs.filter(Q(name__icontains=s) | Q(town__icontains=s))
+            qs = search_campsites(qs, search, rank=self.order_by_relevance())
 
-        # Annotate with like count
-        qs = qs.annotate(
-            like_count=Count('likes', distinct=True)
-        )
+        # has_liked is left out here and overlaid per user in list()
 
-        # Annotate with has_liked for authenticated users
-        if user.is_authenticated:
-            qs = qs.annotate(
-                has_liked=Exists(
-                    CampsiteLike.objects.filter(user=user, campsite_id=OuterRef('pk'))
-                )
-            )
+        # Ordering: premium first, then by like count desc, then by name (id breaks ties)
+        if self.order_by_relevance():
+            qs = qs.order_by('-search_rank', *CAMPSITE_LIST_ORDERING)
         else:
-            qs = qs.annotate(has_liked=Value(False, output_field=BooleanField()))
-
-        # Ordering: premium first, then by like count desc, then by name
-        qs = qs.order_by('-is_premium', '-like_count', 'name')
+            qs = qs.order_by(*CAMPSITE_LIST_ORDERING)
 
         return qs
 
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the page from the catalogue cache and overlay the user's like state.
+
+        The cached part depends only on the query params and whether the user
+        is staff (which decides visibility), so it is shared between users.
+        """
+        fields = self.requested_fields()
+        params = sorted(request.query_params.lists())
+        data = cached_catalogue(
+            'api-campsite-list',
+            (request.scheme, request.get_host(), request.user.is_staff, params),
+            lambda: self.build_page(fields).data,
+        )
+
+        results = data['results']
+        if 'has_liked' in fields:
+            results = overlay_like_state(results, request.user)
+        if request.accepted_renderer.format == CompactJSONRenderer.format:
+            results = {field: [item[field] for item in results] for field in fields}
+        return Response({**data, 'results': results})
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Version the listing by the newest version in the sync feed.
+
+        It is read from the database rather than a per-process cache, so every
+        worker sees a write as soon as it commits; the user, params and
+        renderer are added by ConditionalGetMixin.
+        """
+        return (latest_sync_version(),), None
+
+    def build_page(self, fields):
+        """Paginate and serialize the listing from values() rows, skipping model instances."""
+        # Select only what the fields need, plus the ordering columns the cursors encode
+        columns = dict.fromkeys(campsite_list_columns(fields) + ('is_premium', 'like_count', 'name', 'id'))
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(serialize_campsite_rows(page, fields))
+
+    def requested_fields(self):
+        """Parse ?fields= into the list fields to return, in serializer order."""
+        raw = self.request.query_params.get('fields')
+        if not raw:
+            return CAMPSITE_LIST_FIELDS
+        requested = {field.strip() for field in raw.split(',') if field.strip()}
+        unknown = sorted(requested.difference(CAMPSITE_LIST_FIELDS))
+        if unknown:
+            raise ValidationError({
+                'fields': f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(CAMPSITE_LIST_FIELDS)}."
+            })
+        requested.add('id')
+        return tuple(field for field in CAMPSITE_LIST_FIELDS if field in requested)
+
+    def search_text(self):
+        return (self.request.query_params.get('search') or '').strip()
+
+    def order_by_relevance(self):
+        ordering = self.request.query_params.get('ordering', 'default')
+        if ordering not in ('default', 'relevance'):
+            raise ValidationError({'ordering': "Must be 'default' or 'relevance'."})
+        return ordering == 'relevance' and bool(self.search_text())
+
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
         ctx['request'] = self.request
         return ctx
 
 
-class CampsiteLikeToggleView(APIView):
-    """Toggle like/unlike for a campsite."""
-    authentication_classes = [authentication.SessionAuthentication]
-    permission_classes = [IsAuthenticated]
+TYPE_NAMES = {code: str(name) for code, name in Campsite.TYPE_CHOICES}
+
+
+def _facet_values(counts, labels=None):
+    """Turn a Counter of facet values into the response list, largest first; blank values are left out."""
+    values = [
+        {'value': value, 'label': labels.get(value, value), 'count': count} if labels is not None
+        else {'value': value, 'count': count}
+        for value, count in counts.items() if value != '' and count
+    ]
+    values.sort(key=lambda item: (-item['count'], str(item.get('label', item['value']))))
+    return values
+
+
+@extend_schema(
+    summary="Campsite counts per country, type, province and premium flag",
+    parameters=[
+        OpenApiParameter(name='country', description='2-letter country code, or several separated by commas', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='type', description='Campsite type', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='province', description='Province, state or region (case-insensitive)', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='premium', description='Premium flag (true/false)', required=False, type=OpenApiTypes.BOOL),
+        OpenApiParameter(name='search', description='Free-text search, as on the list endpoint', required=False, type=OpenApiTypes.STR),
+    ],
+)
+class CampsiteFacetsAPIView(APIView):
+    """
+    Count visible campsites per filter value, honouring the active filters.
+
+    Each facet applies every filter but its own, so its counts are what the
+    list would show if that value were picked. Without a search the counts
+    are summed from the CampsiteFacetCount table in one read; with one they
+    are counted over the matching campsites and cached per catalogue version.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        filters = campsite_filters(request.query_params)
+
+        is_staff = request.user.is_staff
+        search = request.query_params.get('search', '').strip()
+        if search:
+            rows = cached_catalogue(
+                'api-campsite-facets', (is_staff, search),
+                lambda: live_facet_rows(search_campsites(visible_campsites(request.user), search)),
+            )
+        else:
+            rows = stored_facet_rows(approved_only=not is_staff)
+
+        total, facets = count_facets(rows, filters)
+        return Response({
+            'count': total,
+            'facets': {
+                'country': _facet_values(facets['country'], COUNTRY_NAMES),
+                'type': _facet_values(facets['type'], TYPE_NAMES),
+                'province': _facet_values(facets['province']),
+                'is_premium': _facet_values(facets['is_premium']),
+            },
+        })
+
+
+NEARBY_DEFAULT_K = 10
+NEARBY_MAX_K = 100
+
+
+def _parse_number_param(params, name, minimum, maximum, cast=float, required=True):
+    """Read a numeric query param, raising a 400 if it is missing, malformed or out of range."""
+    raw = params.get(name)
+    if raw in (None, ''):
+        if required:
+            raise ValidationError({name: 'This parameter is required.'})
+        return None
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValidationError({name: f'Must be a valid {"integer" if cast is int else "number"}.'})
+    if not (minimum <= value <= maximum):
+        raise ValidationError({name: f'Must be between {minimum} and {maximum}.'})
+    return value
+
+
+@extend_schema(
+    summary="Nearest campsites to a point or to another campsite",
+    parameters=[
+        OpenApiParameter(name='lat', description='Latitude of the origin (omit when using a campsite id)', required=False, type=OpenApiTypes.FLOAT),
+        OpenApiParameter(name='lng', description='Longitude of the origin (omit when using a campsite id)', required=False, type=OpenApiTypes.FLOAT),
+        OpenApiParameter(name='k', description=f'Number of campsites to return (default {NEARBY_DEFAULT_K}, max {NEARBY_MAX_K})', required=False, type=OpenApiTypes.INT),
+        OpenApiParameter(name='max_km', description='Only return campsites within this distance', required=False, type=OpenApiTypes.FLOAT),
+    ],
+    responses=NearbyCampsiteSerializer(many=True),
+)
+class CampsiteNearbyAPIView(APIView):
+    """
+    Return the k closest visible campsites, sorted by distance.
+
+    The origin is either ?lat=&lng= or, for the campsite_id variant, the
+    coordinates of that campsite (which is excluded from the results).
+    Candidates come from the in-memory spatial index, so only the k
+    resulting rows are read from the database.
+    """
+    permission_classes = [AllowAny]
 
-    def post(self, request, campsite_id):
-        campsite = get_object_or_404(Campsite, id=campsite_id)
+    def get(self, request, campsite_id=None):
         user = request.user
+        params = request.query_params
+        visible = visible_campsites(user)
+
+        exclude_ids = ()
+        if campsite_id is not None:
+            center = get_object_or_404(visible, pk=campsite_id)
+            if center.latitude is None or center.longitude is None:
+                raise ValidationError({'campsite_id': 'This campsite has no valid coordinates.'})
+            lat, lng = center.latitude, center.longitude
+            exclude_ids = {center.pk}
+        else:
+            lat = _parse_number_param(params, 'lat', -90, 90)
+            lng = _parse_number_param(params, 'lng', -180, 180)
 
-        with transaction.atomic():
-            like, created = CampsiteLike.objects.get_or_create(user=user, campsite=campsite)
-            if created:
-                is_liked = True
-            else:
-                like.delete()
-                is_liked = False
+        max_km = _parse_number_param(params, 'max_km', 0, 20037.5, required=False)
+        k = _parse_number_param(params, 'k', 1, NEARBY_MAX_K, cast=int, required=False) or NEARBY_DEFAULT_K
 
-        like_count = CampsiteLike.objects.filter(campsite=campsite).count()
-        return Response(
-            {'is_liked': is_liked, 'like_count': like_count},
-            status=status.HTTP_200_OK
+        nearest = campsite_index.nearest(
+            lat, lng, k,
+            max_km=max_km,
+            approved_only=not user.is_staff,
+            exclude_ids=exclude_ids,
         )
+        distances = dict(nearest)
+
+        campsites = list(annotate_like_state(visible.filter(pk__in=distances), user))
+        for campsite in campsites:
+            campsite.distance_km = round(distances[campsite.pk], 3)
+        campsites.sort(key=lambda c: c.distance_km)
+
+        serializer = NearbyCampsiteSerializer(campsites, many=True, context={'request': request})
+        return Response({
+            'origin': {'lat': lat, 'lng': lng},
+            'count': len(campsites),
+            'results': serializer.data,
+        })
+
+
+def _parse_bbox(params):
+    """Parse ?bbox=minLng,minLat,maxLng,maxLat into a tuple, or None when absent."""
+    raw = params.get('bbox')
+    if not raw:
+        return None
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in raw.split(','))
+    except ValueError:
+        raise ValidationError({'bbox': 'Must be minLng,minLat,maxLng,maxLat.'})
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValidationError({'bbox': 'Minimum values must not exceed maximum values.'})
+    return min_lng, min_lat, max_lng, max_lat
 
 
-class CampsiteLikeStatusView(APIView):
+MAP_MARKER_LIMIT = 500
+MAP_MAX_LIMIT = 2000
+MAP_DEFAULT_RADIUS_KM = 100
+MAP_MAX_RADIUS_KM = 500
+
+
+@extend_schema(
+    summary="Compact map data for a viewport",
+    parameters=[
+        OpenApiParameter(name='bbox', description='Viewport as minLng,minLat,maxLng,maxLat', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='zoom', description=f'Map zoom level; at {MAX_CLUSTER_ZOOM} or below, dense areas are returned as clusters', required=False, type=OpenApiTypes.INT),
+        OpenApiParameter(name='limit', description=f'Maximum markers to return (default {MAP_MARKER_LIMIT}, max {MAP_MAX_LIMIT})', required=False, type=OpenApiTypes.INT),
+        OpenApiParameter(name='country', description='2-letter country code', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='campsite_id', description='Only campsites within radius_km of this campsite', required=False, type=OpenApiTypes.INT),
+        OpenApiParameter(name='radius_km', description=f'Radius for campsite_id (default {MAP_DEFAULT_RADIUS_KM}, max {MAP_MAX_RADIUS_KM})', required=False, type=OpenApiTypes.FLOAT),
+    ],
+)
+class CampsiteMapAPIView(APIView):
+    """
+    Return the map markers inside a viewport as parallel arrays.
+
+    The payload is column-oriented ({"id": [...], "name": [...], ...}) rather
+    than one object per marker, which keeps it small for dense viewports.
+    Markers are ordered premium first, then by likes, and cut off at limit;
+    "truncated" tells the client that more markers exist in the viewport.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        user = request.user
+        params = request.query_params
+        bbox = _parse_bbox(params)
+        zoom = _parse_number_param(params, 'zoom', 0, 22, cast=int, required=False)
+        limit = _parse_number_param(params, 'limit', 1, MAP_MAX_LIMIT, cast=int, required=False) or MAP_MARKER_LIMIT
+        campsite_id = _parse_number_param(params, 'campsite_id', 1, 2 ** 63 - 1, cast=int, required=False)
+        country = (params.get('country') or '').strip().upper() or None
+        visible = visible_campsites(user)
+
+        markers_qs = visible.filter(latitude__isnull=False, longitude__isnull=False)
+        clusters = []
+
+        if campsite_id is not None:
+            radius_km = _parse_number_param(params, 'radius_km', 0, MAP_MAX_RADIUS_KM, required=False)
+            if radius_km is None:
+                # 0 is a valid radius (just the campsite itself), so only a missing value gets the default
+                radius_km = MAP_DEFAULT_RADIUS_KM
+            center = get_object_or_404(visible, pk=campsite_id)
+            nearby = []
+            if center.latitude is not None and center.longitude is not None:
+                nearby = campsite_index.within_radius(
+                    center.latitude, center.longitude, radius_km, approved_only=not user.is_staff
+                )
+            markers_qs = markers_qs.filter(pk__in=[pk for pk, _ in nearby])
+        elif zoom is not None and zoom <= MAX_CLUSTER_ZOOM:
+            marker_ids = []
+            for cluster in cluster_pyramid.clusters_in_bbox(
+                zoom, bbox, approved_only=not user.is_staff, country=country
+            ):
+                if cluster['id'] is not None:
+                    marker_ids.append(cluster['id'])
+                else:
+                    clusters.append(cluster)
+            markers_qs = markers_qs.filter(pk__in=marker_ids)
+
+        if bbox:
+            min_lng, min_lat, max_lng, max_lat = bbox
+            markers_qs = markers_qs.filter(
+                latitude__range=(min_lat, max_lat),
+                longitude__range=(min_lng, max_lng),
+            )
+        if country:
+            markers_qs = markers_qs.filter(country=country)
+
+        rows = list(
+            markers_qs.order_by('-is_premium', '-like_count', 'pk')
+                      .values_list('pk', 'name', 'country', 'latitude', 'longitude', 'like_count')[:limit + 1]
+        )
+        truncated = len(rows) > limit
+        ids, names, countries, lats, lngs, likes = (
+            (list(col) for col in zip(*rows[:limit])) if rows else ([], [], [], [], [], [])
+        )
+
+        return Response({
+            'zoom': zoom,
+            'truncated': truncated,
+            'markers': {
+                'id': ids,
+                'name': names,
+                'country': [COUNTRY_NAMES.get(code, code) for code in countries],
+                'lat': lats,
+                'lng': lngs,
+                'likes': likes,
+            },
+            'clusters': {
+                'count': [c['count'] for c in clusters],
+                'lat': [c['lat'] for c in clusters],
+                'lng': [c['lng'] for c in clusters],
+                'bounds': [c['bounds'] for c in clusters],
+            },
+        })
+
+
+# DRF views are synchronous, so the like endpoints are plain async Django
+# views answering with DRF's error bodies. Session auth only: CsrfViewMiddleware
+# checks the token on POST, as SessionAuthentication does for DRF views.
+
+def _not_authenticated():
+    return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+
+
+def _campsite_not_found():
+    return JsonResponse({'detail': 'No Campsite matches the given query.'}, status=404)
+
+
+@require_POST
+async def campsite_like_toggle(request, campsite_id):
+    """Toggle like/unlike for a campsite, returning the new state and count in one statement."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+
+    result = await sync_to_async(toggle_campsite_like)(user.pk, campsite_id)
+    if result is None:
+        return _campsite_not_found()
+
+    is_liked, like_count = result
+    return JsonResponse({'is_liked': is_liked, 'like_count': like_count})
+
+
+@require_safe
+async def campsite_like_status(request, campsite_id):
     """Get like status and count for a campsite."""
-    authentication_classes = [authentication.SessionAuthentication]
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request, campsite_id):
-        campsite = get_object_or_404(Campsite, id=campsite_id)
-        is_liked = CampsiteLike.objects.filter(user=request.user, campsite=campsite).exists()
-        like_count = CampsiteLike.objects.filter(campsite=campsite).count()
-        return Response(
-            {'is_liked': is_liked, 'like_count': like_count},
-            status=status.HTTP_200_OK
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+
+    like_count = await Campsite.objects.filter(pk=campsite_id).values_list('like_count', flat=True).afirst()
+    if like_count is None:
+        return _campsite_not_found()
+
+    is_liked = await CampsiteLike.objects.filter(user=user, campsite_id=campsite_id).aexists()
+    return JsonResponse({'is_liked': is_liked, 'like_count': like_count})
+
+
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_LIMIT = 2000
+
+
+@extend_schema(
+    summary="Campsite changes since a sync cursor",
+    parameters=[
+        OpenApiParameter(name='since', description='next_cursor from the previous call; omit for a full initial download', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='limit', description=f'Maximum changes per call (default {SYNC_PAGE_SIZE}, max {SYNC_MAX_LIMIT})', required=False, type=OpenApiTypes.INT),
+    ],
+)
+class CampsiteChangesAPIView(APIView):
+    """
+    Delta sync feed for offline and mobile clients.
+
+    "changes" holds the current data (CampsiteSerializer fields) of campsites
+    edited, approved or liked/unliked since the cursor; "deleted" lists ids
+    to drop: deleted campsites and, for non-staff users, campsites that are
+    no longer approved. Clients call again with next_cursor until has_more is
+    false and keep the last cursor for the next sync. Without ?since= the feed
+    starts from the beginning, which doubles as the initial download.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        user = request.user
+        params = request.query_params
+        since = 0
+        if params.get('since'):
+            try:
+                since = decode_sync_cursor(params['since'])
+            except ValueError as e:
+                raise ValidationError({'since': str(e)})
+        limit = _parse_number_param(params, 'limit', 1, SYNC_MAX_LIMIT, cast=int, required=False) or SYNC_PAGE_SIZE
+
+        campsites = Campsite.objects.filter(sync_version__gt=since)
+        tombstones = CampsiteTombstone.objects.filter(sync_version__gt=since)
+        if since == 0:
+            # A fresh client has nothing to delete
+            tombstones = tombstones.none()
+            if not user.is_staff:
+                campsites = campsites.filter(is_approved=True)
+
+        # Take up to limit + 1 from each side so the merged head is exact and has_more is known
+        rows = campsites.order_by('sync_version').values(*CAMPSITE_LIST_COLUMNS, 'sync_version')[:limit + 1]
+        entries = sorted(
+            [(row['sync_version'], row) for row in rows]
+            + [(version, pk) for pk, version in tombstones.order_by('sync_version').values_list('campsite_id', 'sync_version')[:limit + 1]],
+            key=lambda entry: entry[0],
         )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        changed, deleted = [], []
+        for _, entry in entries:
+            if not isinstance(entry, dict):
+                deleted.append(entry)
+            elif entry['is_approved'] or user.is_staff:
+                changed.append(entry)
+            else:
+                deleted.append(entry['id'])
+
+        return Response({
+            'changes': overlay_like_state(serialize_campsite_rows(changed), user),
+            'deleted': deleted,
+            'next_cursor': encode_sync_cursor(entries[-1][0] if entries else since),
+            'has_more': has_more,
+        })
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() returns the data, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+@extend_schema(
+    summary="Export the whole campsite catalogue (NDJSON or CSV)",
+    parameters=[
+        OpenApiParameter(name='country', description='2-letter country code, or several separated by commas', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='type', description='Campsite type', required=False, type=OpenApiTypes.STR, enum=[code for code, _ in Campsite.TYPE_CHOICES]),
+        OpenApiParameter(name='province', description='Province, state or region (case-insensitive)', required=False, type=OpenApiTypes.STR),
+        OpenApiParameter(name='premium', description='Only premium (true) or only non-premium (false) campsites', required=False, type=OpenApiTypes.BOOL),
+        OpenApiParameter(name='search', description='Full-text search in name, town, province and description, with typo-tolerant matching on name and town', required=False, type=OpenApiTypes.STR),
+    ],
+)
+class CampsiteExportView(APIView):
+    """
+    Stream every visible campsite as NDJSON or CSV, ordered by id.
+
+    Takes the same filters and search as the list endpoint. Rows are read
+    through a server-side cursor in chunks of EXPORT_CHUNK_SIZE and written
+    out as they arrive, so memory stays flat however large the catalogue is,
+    under WSGI and ASGI alike. Columns mirror CampsiteSerializer.
+    """
+    permission_classes = [AllowAny]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body format comes from the URL; errors fall back to JSON whatever the Accept header says
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, export_format):
+        user = request.user
+        params = request.query_params
+        qs = filter_campsites(visible_campsites(user), campsite_filters(params))
+        search = params.get('search', '').strip()
+        if search:
+            qs = search_campsites(qs, search)
+        rows = annotate_like_state(qs, user).order_by('pk').values(*CAMPSITE_LIST_COLUMNS, 'has_liked')
+
+        if export_format == 'csv':
+            writer = csv.writer(_Echo())
+            header = writer.writerow(CAMPSITE_LIST_FIELDS)
+            encode = lambda item: writer.writerow(item.values())
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            header = None
+            encode = lambda item: json.dumps(item, ensure_ascii=False) + '\n'
+            content_type = 'application/x-ndjson'
+
+        # Django's ASGI handler reads a sync iterator to the end before sending
+        # anything, and its WSGI handler does the same with an async one, so
+        # stream from the kind the server can pass through chunk by chunk
+        if isinstance(request._request, ASGIRequest):
+            content = self._astream(rows, header, encode)
+        else:
+            content = self._stream(rows, header, encode)
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="campsites.{export_format}"'
+        return response
+
+    @staticmethod
+    def _item(row):
+        item = serialize_campsite_rows((row,))[0]
+        item['has_liked'] = row['has_liked']
+        return item
+
+    def _stream(self, rows, header, encode):
+        if header is not None:
+            yield header
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield encode(self._item(row))
+
+    async def _astream(self, rows, header, encode):
+        if header is not None:
+            yield header
+        async for row in rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield encode(self._item(row))
+
+
+LIKE_STATUS_MAX_IDS = 500
+
+
+@extend_schema(
+    summary="Like status for many campsites",
+    parameters=[
+        OpenApiParameter(name='ids', description=f'Comma-separated campsite ids (at most {LIKE_STATUS_MAX_IDS})', required=True, type=OpenApiTypes.STR),
+    ],
+)
+class CampsiteLikeBulkStatusView(APIView):
+    """
+    Return {id: {is_liked, like_count}} for a batch of campsites in one query.
+
+    Lets pages hydrate every like button with a single request instead of a
+    like-status call per card. Ids that don't exist or aren't visible to the
+    user are left out; anonymous users get is_liked false.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        raw = request.query_params.get('ids', '')
+        try:
+            ids = {int(part) for part in raw.split(',') if part.strip()}
+        except ValueError:
+            raise ValidationError({'ids': 'Must be a comma-separated list of integers.'})
+        if not ids:
+            raise ValidationError({'ids': 'This parameter is required.'})
+        if len(ids) > LIKE_STATUS_MAX_IDS:
+            raise ValidationError({'ids': f'At most {LIKE_STATUS_MAX_IDS} ids are allowed.'})
+
+        rows = annotate_like_state(
+            visible_campsites(request.user).filter(pk__in=ids), request.user
+        ).order_by().values_list('pk', 'has_liked', 'like_count')
+
+        return Response({
+            str(pk): {'is_liked': has_liked, 'like_count': like_count}
+            for pk, has_liked, like_count in rows
+        })
 
 
 # Custom Permission
@@ -140,16 +813,16 @@ class IsSuperAdmin(BasePermission):
     """Custom permission to only allow super admins."""
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            (request.user.is_super_admin or request.user.is_superuser)
+        return bool(
+            request.user and
+            request.user.is_authenticated and
+            get_capabilities(request).can_manage_products
         )
 
 
 # Product API Views
 
-class ProductListAPIView(generics.ListAPIView):
+class ProductListAPIView(ConditionalGetMixin, generics.ListAPIView):
     """List all featured products."""
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
@@ -157,13 +830,24 @@ class ProductListAPIView(generics.ListAPIView):
     def get_queryset(self):
         return Product.objects.filter(is_featured=True).order_by('name')
 
+    def get_validators(self, request, *args, **kwargs):
+        stats = self.get_queryset().order_by().aggregate(count=Count('pk'), last_updated=Max('updated_at'))
+        return (stats['count'], stats['last_updated']), stats['last_updated']
 
-class ProductDetailAPIView(generics.RetrieveAPIView):
+
+class ProductDetailAPIView(ConditionalGetMixin, generics.RetrieveAPIView):
     """Retrieve a single product."""
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
     queryset = Product.objects.all()
 
+    def get_validators(self, request, *args, **kwargs):
+        last_updated = self.get_queryset().filter(pk=kwargs['pk']).values_list('updated_at', flat=True).first()
+        if last_updated is None:
+            # Unknown product: let the view answer with its 404
+            return None, None
+        return (kwargs['pk'], last_updated), last_updated
+
 
 class ProductCreateAPIView(generics.CreateAPIView):
     """Create a new product (super admin only)."""
@@ -0,0 +1,94 @@
+"""
+Benchmark rendering the campsite list cards from cached fragments against rendering them per request.
+
+Campsites are built in memory and the configured cache backend (local
+memory by default) holds the fragments, so no database is needed. "per
+request" renders every card's template, as the list page did before
+fragment caching; "cold" is a fragment cache miss for every card, which
+renders both like states; "warm" is the steady state, where only the like
+state is picked per card.
+
+Run from the project root:
+    uv run python benchmarks/card_rendering.py
+"""
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+
+from benchmarks.timing import best_of  # noqa: E402
+from core.fragments import CAMPSITE_CARD_TEMPLATE, campsite_cards  # noqa: E402
+from core.models import Campsite  # noqa: E402
+
+CARD_COUNTS = [30, 100]
+REPEAT = 20
+
+
+def random_campsites(n, rng):
+    countries = [code for code, _ in Campsite.COUNTRY_CHOICES]
+    now = datetime.now(timezone.utc)
+    return [
+        Campsite(
+            pk=i + 1,
+            name=f"Campsite {i}",
+            town=f"Town {rng.randrange(1000)}",
+            description="A quiet campsite by the lake. " * rng.randrange(1, 10),
+            country=rng.choice(countries),
+            image_url=rng.choice([None, f"https://ik.imagekit.io/demo/{i}.jpg"]),
+            website=f"https://campsite{i}.example.com",
+            phone_number="+34 600 000 000",
+            is_premium=rng.random() < 0.1,
+            is_approved=True,
+            like_count=rng.randrange(500),
+            updated_at=now - timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def per_request(campsites, user, liked_campsite_ids):
+    show_pending = user.is_staff or user.is_superuser
+    return [
+        render_to_string(CAMPSITE_CARD_TEMPLATE, {
+            "campsite": campsite,
+            "liked": campsite.pk in liked_campsite_ids,
+            "show_pending": show_pending,
+            "auth_required": not user.is_authenticated,
+        })
+        for campsite in campsites
+    ]
+
+
+def main():
+    rng = random.Random(42)
+    user = get_user_model()(username="benchmark")
+
+    print(f"{'cards':>6} {'per request (ms)':>17} {'cold (ms)':>10} {'warm (ms)':>10} {'speedup':>8}")
+    for n in CARD_COUNTS:
+        campsites = random_campsites(n, rng)
+        liked = {campsite.pk for campsite in rng.sample(campsites, n // 5)}
+
+        cache.clear()
+        assert campsite_cards(campsites, user, liked) == per_request(campsites, user, liked)
+
+        baseline = best_of(lambda: per_request(campsites, user, liked), repeat=REPEAT)
+        cold = best_of(lambda: campsite_cards(campsites, user, liked), setup=cache.clear, repeat=REPEAT)
+        campsite_cards(campsites, user, liked)
+        warm = best_of(lambda: campsite_cards(campsites, user, liked), repeat=REPEAT)
+
+        print(f"{n:>6} {baseline * 1000:>17.2f} {cold * 1000:>10.2f} {warm * 1000:>10.2f} {baseline / warm:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the vectorized Haversine helpers against the scalar Python loop.
+
+Run from the project root:
+    uv run python benchmarks/haversine.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.timing import best_of  # noqa: E402
+from core.utils import calculate_distance, haversine_distances, pairwise_haversine_distances  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+PAIRWISE_ORIGINS = 50
+ORIGIN = (46.0, 8.0)
+
+
+def random_points(n, rng):
+    # Roughly the bounding box of Europe
+    return rng.uniform(35.0, 71.0, n), rng.uniform(-25.0, 45.0, n)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    lat0, lng0 = ORIGIN
+
+    print(f"{'points':>10} {'loop (ms)':>12} {'numpy (ms)':>12} {'speedup':>9}")
+    for n in SIZES:
+        lats, lngs = random_points(n, rng)
+        lat_list, lng_list = lats.tolist(), lngs.tolist()
+
+        loop = best_of(lambda: [calculate_distance(lat0, lng0, a, b) for a, b in zip(lat_list, lng_list)])
+        vec = best_of(lambda: haversine_distances(lat0, lng0, lats, lngs))
+
+        expected = np.array([calculate_distance(lat0, lng0, a, b) for a, b in zip(lat_list[:1000], lng_list[:1000])])
+        assert np.allclose(haversine_distances(lat0, lng0, lats[:1000], lngs[:1000]), expected)
+
+        print(f"{n:>10,} {loop * 1000:>12.1f} {vec * 1000:>12.1f} {loop / vec:>8.0f}x")
+
+    print()
+    print(f"Pairwise matrix, {PAIRWISE_ORIGINS} origins")
+    print(f"{'points':>10} {'loop (ms)':>12} {'numpy (ms)':>12} {'speedup':>9}")
+    origin_lats, origin_lngs = random_points(PAIRWISE_ORIGINS, rng)
+    for n in SIZES[:2]:
+        lats, lngs = random_points(n, rng)
+        lat_list, lng_list = lats.tolist(), lngs.tolist()
+
+        loop = best_of(
+            lambda: [
+                [calculate_distance(oa, ob, a, b) for a, b in zip(lat_list, lng_list)]
+                for oa, ob in zip(origin_lats.tolist(), origin_lngs.tolist())
+            ],
+            repeat=1,
+        )
+        vec = best_of(lambda: pairwise_haversine_distances(origin_lats, origin_lngs, lats, lngs))
+
+        print(f"{n:>10,} {loop * 1000:>12.1f} {vec * 1000:>12.1f} {loop / vec:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
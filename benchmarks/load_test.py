@@ -0,0 +1,124 @@
+"""
+Load test the campsite list, detail, like and health endpoints over HTTP.
+
+Start the server in the mode under test, then point the script at it. To
+compare the WSGI and ASGI deployments, run it once against each with the
+same number of workers:
+
+    uv run gunicorn --workers 3 --bind 127.0.0.1:8000 config.wsgi:application
+    uv run uvicorn --workers 3 --port 8000 config.asgi:application
+
+    uv run --with httpx python benchmarks/load_test.py --username USER --password PASS
+
+The user is logged in once through the login form and every request shares
+that session. Each virtual client cycles through the endpoints back to back
+for --duration seconds; like toggles write to the database, so run this
+against a development copy.
+"""
+import argparse
+import asyncio
+import re
+import statistics
+import time
+
+import httpx
+
+CONCURRENCY_LEVELS = [10, 100, 300]
+DURATION = 10
+
+
+def endpoints(campsite_id, likes=True):
+    """Return the (method, path) cycle each virtual client walks through."""
+    paths = [
+        ("GET", "/campsites/"),
+        ("GET", f"/campsites/{campsite_id}/"),
+        ("GET", f"/api/campsites/{campsite_id}/like-status/"),
+        ("GET", "/api/health/"),
+    ]
+    if likes:
+        paths.append(("POST", f"/api/campsites/{campsite_id}/like/"))
+    return paths
+
+
+async def login(client, username, password):
+    """Log in through the login form so requests carry a session and CSRF cookie."""
+    page = await client.get("/login/")
+    token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page.text).group(1)
+    response = await client.post(
+        "/login/",
+        data={"username": username, "password": password, "csrfmiddlewaretoken": token},
+        headers={"Referer": str(page.url)},
+    )
+    if "sessionid" not in client.cookies:
+        raise SystemExit(f"Login failed for {username!r} (HTTP {response.status_code})")
+
+
+async def first_campsite_id(client):
+    response = await client.get("/api/campsites/", params={"fields": "id"})
+    response.raise_for_status()
+    results = response.json()["results"]
+    if not results:
+        raise SystemExit("No campsites to load test against")
+    return results[0]["id"]
+
+
+async def virtual_client(client, cycle, offset, deadline, latencies, errors):
+    headers = {"X-CSRFToken": client.cookies["csrftoken"]}
+    i = offset
+    while time.perf_counter() < deadline:
+        method, path = cycle[i % len(cycle)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, headers=headers)
+        except httpx.HTTPError:
+            errors.append(path)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(path)
+
+
+async def run_level(client, cycle, concurrency, duration):
+    """Run `concurrency` clients for `duration` seconds; return (req/s, p50, p99, errors)."""
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_client(client, cycle, n, deadline, latencies, errors)
+        for n in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return len(latencies) / elapsed, quantiles[49], quantiles[98], len(errors)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--campsite", type=int, help="Campsite id to request (default: first in the list API)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS)
+    parser.add_argument("--duration", type=float, default=DURATION, help="Seconds per concurrency level")
+    parser.add_argument("--no-likes", action="store_true", help="Leave like toggles out of the mix")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        await login(client, args.username, args.password)
+        campsite_id = args.campsite or await first_campsite_id(client)
+        cycle = endpoints(campsite_id, likes=not args.no_likes)
+
+        # Warm up connections and the catalogue cache
+        await run_level(client, cycle, min(args.concurrency), 1)
+
+        print(f"{'clients':>8} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}")
+        for concurrency in args.concurrency:
+            rate, p50, p99, errors = await run_level(client, cycle, concurrency, args.duration)
+            print(f"{concurrency:>8} {rate:>9.0f} {p50 * 1000:>9.1f} {p99 * 1000:>9.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
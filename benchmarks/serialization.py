@@ -0,0 +1,84 @@
+"""
+Benchmark the campsite list API's values()-based serialization against CampsiteSerializer.
+
+Rows are generated in memory, so no database is needed. The serializer path
+includes building model instances from the rows (as Django does when
+fetching a queryset), since avoiding that is part of the fast path's gain.
+
+Run from the project root:
+    uv run python benchmarks/serialization.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.serializers import CAMPSITE_LIST_COLUMNS, CampsiteSerializer, serialize_campsite_rows  # noqa: E402
+from benchmarks.timing import best_of  # noqa: E402
+from core.models import Campsite  # noqa: E402
+
+PAGE_SIZES = [30, 100, 500]
+REPEAT = 20
+
+
+def random_rows(n, rng):
+    countries = [code for code, _ in Campsite.COUNTRY_CHOICES]
+    types = [code for code, _ in Campsite.TYPE_CHOICES]
+    return [
+        {
+            "id": i + 1,
+            "name": f"Campsite {i}",
+            "town": f"Town {rng.randrange(1000)}",
+            "description": "A quiet campsite by the lake. " * rng.randrange(1, 10),
+            "country": rng.choice(countries),
+            "image_url": rng.choice([None, f"https://ik.imagekit.io/demo/{i}.jpg"]),
+            "website": f"https://campsite{i}.example.com",
+            "phone_number": "+34 600 000 000",
+            "is_premium": rng.random() < 0.1,
+            "is_approved": True,
+            "like_count": rng.randrange(500),
+            "type": rng.choice(types),
+            "province": f"Province {rng.randrange(50)}",
+        }
+        for i in range(n)
+    ]
+
+
+# from_db() expects the loaded values in model field order
+MODEL_COLUMNS = [f.attname for f in Campsite._meta.concrete_fields if f.attname in CAMPSITE_LIST_COLUMNS]
+
+
+def with_model_serializer(rows):
+    campsites = []
+    for row in rows:
+        campsite = Campsite.from_db("default", MODEL_COLUMNS, [row[c] for c in MODEL_COLUMNS])
+        campsite.has_liked = False
+        campsites.append(campsite)
+    return CampsiteSerializer(campsites, many=True).data
+
+
+def main():
+    rng = random.Random(42)
+    renderer = JSONRenderer()
+
+    print(f"{'page size':>10} {'serializer (ms)':>16} {'values (ms)':>12} {'speedup':>9}")
+    for size in PAGE_SIZES:
+        rows = random_rows(size, rng)
+        assert renderer.render(with_model_serializer(rows)) == renderer.render(serialize_campsite_rows(rows))
+
+        slow = best_of(lambda: with_model_serializer(rows), repeat=REPEAT)
+        fast = best_of(lambda: serialize_campsite_rows(rows), repeat=REPEAT)
+
+        print(f"{size:>10} {slow * 1000:>16.2f} {fast * 1000:>12.2f} {slow / fast:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Timing helpers shared by the benchmark scripts."""
+import time
+
+
+def best_of(func, setup=None, repeat=3):
+    """Return the fastest wall-clock time of several runs, in seconds.
+
+    ``setup`` runs before each run, outside the timed section.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -1,16 +1,49 @@
 import csv
 import io
+from collections import Counter
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
 from django.shortcuts import render, redirect
 from django.urls import path
 from django.contrib import messages
 from django.http import HttpResponse
+from django.utils import timezone
 from .models import Campsite, Product
+from .spatial import campsite_index
+from .caching import bump_catalogue_version
+from .facets import FACET_FIELDS, adjust_facet_counts
+from .suggestions import adjust_approved_campsites_counts
+from .sync import bump_sync_versions_on_commit
 
 
 def approve_campsites(modeladmin, request, queryset):
     """Admin action to approve selected campsites."""
-    updated = queryset.update(is_approved=True)
+    with transaction.atomic():
+        # Facet counts of the campsites about to move from pending to approved
+        pending = queryset.filter(is_approved=False).order_by().values_list(*FACET_FIELDS).annotate(total=Count('pk'))
+        deltas = Counter()
+        for *values, total in pending:
+            deltas[(False, *values)] -= total
+            deltas[(True, *values)] += total
+
+        # Approved suggestions per suggester, for the auto-approval counter
+        suggesters = (
+            queryset.filter(is_approved=False, suggested_by__isnull=False)
+            .order_by().values_list('suggested_by').annotate(total=Count('pk'))
+        )
+        suggester_deltas = dict(suggesters)
+
+        # Touch updated_at, and move the sync version once this commits, since
+        # API validators and delta sync are derived from them
+        campsite_ids = list(queryset.values_list('pk', flat=True))
+        updated = queryset.update(is_approved=True, updated_at=timezone.now())
+        bump_sync_versions_on_commit(campsite_ids)
+        adjust_facet_counts(deltas)
+        adjust_approved_campsites_counts(suggester_deltas)
+    # update() bypasses post_save, so drop the spatial index and cached reads explicitly
+    campsite_index.invalidate()
+    bump_catalogue_version()
     modeladmin.message_user(request, f'{updated} campsite(s) approved.')
 approve_campsites.short_description = "Approve selected campsites"
 
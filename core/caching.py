@@ -0,0 +1,80 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+
+# Every cached catalogue read is keyed by this version, so bumping it on any
+# Campsite/CampsiteLike write invalidates all of them at once.
+CATALOGUE_VERSION_KEY = 'campsites:catalogue-version'
+CATALOGUE_CACHE_TIMEOUT = 60 * 10
+
+
+def get_catalogue_version() -> int:
+    """Return the current catalogue version, initialising it if the cache has none."""
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1 so an evicted counter can't come back
+        # at a version that still has stale entries cached under it
+        cache.add(CATALOGUE_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+async def aget_catalogue_version() -> int:
+    """Async version of get_catalogue_version()."""
+    version = await cache.aget(CATALOGUE_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOGUE_VERSION_KEY, int(time.time() * 1000), None)
+        version = await cache.aget(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version():
+    """Invalidate every cached catalogue read."""
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _parts_digest(parts) -> str:
+    return hashlib.md5(
+        json.dumps(parts, sort_keys=True, default=str).encode('utf-8'),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+def catalogue_cache_key(namespace: str, *parts) -> str:
+    """Build a cache key for a catalogue read from a namespace and JSON-serializable parts."""
+    return f'campsites:{namespace}:v{get_catalogue_version()}:{_parts_digest(parts)}'
+
+
+async def acatalogue_cache_key(namespace: str, *parts) -> str:
+    """Async version of catalogue_cache_key()."""
+    return f'campsites:{namespace}:v{await aget_catalogue_version()}:{_parts_digest(parts)}'
+
+
+def cached_catalogue(namespace: str, parts, build, timeout: int = CATALOGUE_CACHE_TIMEOUT):
+    """
+    Return the cached value for (namespace, parts), calling build() on a miss.
+
+    Only data shared by every user with the same visibility belongs here;
+    per-user state such as like flags must be overlaid by the caller.
+    """
+    key = catalogue_cache_key(namespace, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def acached_catalogue(namespace: str, parts, build, timeout: int = CATALOGUE_CACHE_TIMEOUT):
+    """Async version of cached_catalogue(); build is a coroutine function."""
+    key = await acatalogue_cache_key(namespace, *parts)
+    value = await cache.aget(key)
+    if value is None:
+        value = await build()
+        await cache.aset(key, value, timeout)
+    return value
@@ -0,0 +1,117 @@
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .spatial import campsite_index
+
+# Clusters are formed on a square pixel grid in Web Mercator space, so the
+# grid cells get smaller in degrees as the zoom level goes up.
+TILE_SIZE_PX = 256
+CLUSTER_CELL_PX = 60
+
+# Past this zoom level every campsite is returned as an individual marker
+MAX_CLUSTER_ZOOM = 14
+MAX_LATITUDE = 85.05112878
+
+
+def _project(lat: float, lng: float, zoom: int) -> Tuple[float, float]:
+    """Project a coordinate to Web Mercator world pixels at the given zoom."""
+    world_size = TILE_SIZE_PX * (2 ** zoom)
+    lat = max(min(lat, MAX_LATITUDE), -MAX_LATITUDE)
+    sin_lat = math.sin(math.radians(lat))
+    x = (lng + 180.0) / 360.0 * world_size
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * world_size
+    return x, y
+
+
+class CampsiteClusterPyramid:
+    """
+    Per-zoom marker clusters derived from the campsite spatial index.
+
+    Each (zoom, visibility, country) level is computed once and cached until
+    the spatial index is rebuilt, which happens whenever a campsite changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._levels: Dict[Tuple[int, bool, Optional[str]], List[dict]] = {}
+
+    def _build_level(self, entries, zoom: int, approved_only: bool, country: Optional[str]) -> List[dict]:
+        cells = {}
+        for pk, lat, lng, is_approved, entry_country in entries:
+            if approved_only and not is_approved:
+                continue
+            if country and entry_country != country:
+                continue
+            x, y = _project(lat, lng, zoom)
+            key = (int(x // CLUSTER_CELL_PX), int(y // CLUSTER_CELL_PX))
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [1, lat, lng, lat, lng, lat, lng, pk]
+            else:
+                cell[0] += 1
+                cell[1] += lat
+                cell[2] += lng
+                cell[3] = min(cell[3], lat)
+                cell[4] = min(cell[4], lng)
+                cell[5] = max(cell[5], lat)
+                cell[6] = max(cell[6], lng)
+
+        clusters = []
+        for count, sum_lat, sum_lng, min_lat, min_lng, max_lat, max_lng, pk in cells.values():
+            clusters.append({
+                "id": pk if count == 1 else None,
+                "count": count,
+                "lat": sum_lat / count,
+                "lng": sum_lng / count,
+                "bounds": [min_lat, min_lng, max_lat, max_lng],
+            })
+        return clusters
+
+    def get_level(self, zoom: int, approved_only: bool = True, country: Optional[str] = None) -> List[dict]:
+        """
+        Return the clusters for a zoom level.
+
+        Single-campsite clusters carry the campsite id; larger ones have id None.
+        """
+        zoom = max(0, min(int(zoom), MAX_CLUSTER_ZOOM))
+        country = country.upper() if country else None
+        generation, entries = campsite_index.snapshot()
+        key = (zoom, approved_only, country)
+
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._levels = {}
+            level = self._levels.get(key)
+            if level is None:
+                level = self._build_level(entries, zoom, approved_only, country)
+                self._levels[key] = level
+        return level
+
+    def clusters_in_bbox(
+        self,
+        zoom: int,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        approved_only: bool = True,
+        country: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Return the clusters of a zoom level whose bounds intersect the bbox.
+
+        Args:
+            bbox: (min_lng, min_lat, max_lng, max_lat), or None for the whole level
+        """
+        level = self.get_level(zoom, approved_only, country)
+        if bbox is None:
+            return level
+        min_lng, min_lat, max_lng, max_lat = bbox
+        return [
+            c for c in level
+            if c["bounds"][0] <= max_lat and c["bounds"][2] >= min_lat
+            and c["bounds"][1] <= max_lng and c["bounds"][3] >= min_lng
+        ]
+
+
+cluster_pyramid = CampsiteClusterPyramid()
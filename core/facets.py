@@ -0,0 +1,152 @@
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+
+from .models import Campsite, CampsiteFacetCount
+
+# Campsite fields the list can be filtered on and counted by
+FACET_FIELDS = ('country', 'type', 'province', 'is_premium')
+
+# A facet table row is identified by approval state plus the facet values
+FACET_KEY_FIELDS = ('is_approved',) + FACET_FIELDS
+
+# Adds to existing rows and creates missing ones in one statement; decrements
+# go through adjust_facet_counts' UPDATE instead, since a missing row can't
+# start out negative
+INCREMENT_FACETS_SQL = """
+INSERT INTO {table} (is_approved, country, type, province, is_premium, campsite_count)
+VALUES {values}
+ON CONFLICT (is_approved, country, type, province, is_premium)
+DO UPDATE SET campsite_count = {table}.campsite_count + EXCLUDED.campsite_count
+"""
+
+
+def facet_key(campsite):
+    """Return the facet table key of a campsite instance."""
+    return tuple(getattr(campsite, field) for field in FACET_KEY_FIELDS)
+
+
+def adjust_facet_counts(deltas):
+    """
+    Apply {facet key: change} to the facet table.
+
+    Keys are (is_approved, country, type, province, is_premium) tuples.
+    """
+    increments = [(key, n) for key, n in deltas.items() if n > 0]
+    decrements = [(key, -n) for key, n in deltas.items() if n < 0]
+
+    if increments:
+        table = connection.ops.quote_name(CampsiteFacetCount._meta.db_table)
+        sql = INCREMENT_FACETS_SQL.format(
+            table=table,
+            values=', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(increments)),
+        )
+        params = [value for key, n in increments for value in (*key, n)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    for key, n in decrements:
+        CampsiteFacetCount.objects.filter(**dict(zip(FACET_KEY_FIELDS, key))).update(
+            campsite_count=Greatest(F('campsite_count') - n, 0)
+        )
+
+
+def stored_facet_rows(approved_only):
+    """
+    Return [(country, type, province, is_premium, count)] from the facet table.
+
+    Staff (approved_only=False) see both approval states summed together.
+    """
+    qs = CampsiteFacetCount.objects.filter(campsite_count__gt=0)
+    if approved_only:
+        return list(qs.filter(is_approved=True).values_list(*FACET_FIELDS, 'campsite_count'))
+    return list(
+        qs.order_by().values_list(*FACET_FIELDS).annotate(total=Sum('campsite_count'))
+    )
+
+
+def facet_countries(approved_only):
+    """Country codes that have at least one visible campsite, in code order."""
+    qs = CampsiteFacetCount.objects.filter(campsite_count__gt=0)
+    if approved_only:
+        qs = qs.filter(is_approved=True)
+    return qs.order_by('country').values_list('country', flat=True).distinct()
+
+
+def pending_count(country=None):
+    """Number of campsites awaiting approval, optionally in one country, summed from the facet table."""
+    qs = CampsiteFacetCount.objects.filter(is_approved=False)
+    if country:
+        qs = qs.filter(country=country)
+    return qs.aggregate(total=Sum('campsite_count'))['total'] or 0
+
+
+def pending_countries():
+    """Country codes that have at least one campsite awaiting approval, in code order."""
+    return (
+        CampsiteFacetCount.objects.filter(is_approved=False, campsite_count__gt=0)
+        .order_by('country').values_list('country', flat=True).distinct()
+    )
+
+
+def live_facet_rows(queryset):
+    """Return the same rows as stored_facet_rows() counted over a campsite queryset."""
+    return list(queryset.order_by().values_list(*FACET_FIELDS).annotate(total=Count('pk')))
+
+
+def count_facets(rows, filters):
+    """
+    Count campsites per facet value from facet rows.
+
+    filters maps facet fields to the value the list is filtered on, or to a
+    list of accepted values (strings compare case-insensitively). Each facet
+    applies every filter except its own, so it lists the values the user
+    could switch to along with how many campsites each would show.
+
+    Returns (total, {field: Counter(value -> count)}), where total is the
+    number of campsites matching all filters.
+    """
+    def same(stored, value):
+        if isinstance(value, (list, tuple)):
+            return any(same(stored, v) for v in value)
+        if isinstance(stored, str):
+            return stored.casefold() == value.casefold()
+        return stored == value
+
+    def matches(row, skip=None):
+        return all(
+            same(row[FACET_FIELDS.index(field)], value)
+            for field, value in filters.items() if field != skip
+        )
+
+    total = sum(row[-1] for row in rows if matches(row))
+    facets = {}
+    for i, field in enumerate(FACET_FIELDS):
+        counts = Counter()
+        for row in rows:
+            if matches(row, skip=field):
+                counts[row[i]] += row[-1]
+        facets[field] = counts
+    return total, facets
+
+
+def rebuild_facet_counts():
+    """
+    Recount the whole facet table from the campsites.
+
+    Returns the number of facet rows whose stored count was wrong or missing.
+    """
+    actual = {
+        row[:-1]: row[-1]
+        for row in Campsite.objects.order_by().values_list(*FACET_KEY_FIELDS).annotate(total=Count('pk'))
+    }
+    stored = {
+        row[:-1]: row[-1]
+        for row in CampsiteFacetCount.objects.values_list(*FACET_KEY_FIELDS, 'campsite_count')
+    }
+    deltas = {key: actual.get(key, 0) - stored.get(key, 0) for key in actual.keys() | stored.keys()}
+    deltas = {key: n for key, n in deltas.items() if n}
+    adjust_facet_counts(deltas)
+    return len(deltas)
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .caching import CATALOGUE_CACHE_TIMEOUT
+
+CAMPSITE_CARD_TEMPLATE = 'campsites/card.html'
+
+
+def campsite_card_key(campsite, show_pending: bool, auth_required: bool) -> str:
+    """
+    Cache key of a rendered campsite card.
+
+    Saving a campsite moves updated_at and liking it moves like_count, so a
+    changed card gets a new key and stale fragments simply expire.
+    """
+    version = f'{campsite.updated_at.timestamp():.6f}:{campsite.like_count}'
+    return f'campsites:card:{campsite.pk}:{version}:{int(show_pending)}{int(auth_required)}'
+
+
+def render_campsite_card(campsite, show_pending: bool, auth_required: bool):
+    """Render a card in both like states, as the (not liked, liked) pair that gets cached."""
+    context = {'campsite': campsite, 'show_pending': show_pending, 'auth_required': auth_required}
+    return tuple(
+        render_to_string(CAMPSITE_CARD_TEMPLATE, {**context, 'liked': liked})
+        for liked in (False, True)
+    )
+
+
+def _card_viewer(user):
+    """The parts of the user a card depends on: (show_pending, auth_required)."""
+    return user.is_staff or user.is_superuser, not user.is_authenticated
+
+
+def _assemble(campsites, keys, cached, viewer, liked_campsite_ids):
+    """Render the cache misses and pick each card's like state; return (cards, misses to store)."""
+    cards, misses = [], {}
+    for campsite, key in zip(campsites, keys):
+        fragment = cached.get(key)
+        if fragment is None:
+            fragment = misses[key] = render_campsite_card(campsite, *viewer)
+        cards.append(mark_safe(fragment[campsite.pk in liked_campsite_ids]))
+    return cards, misses
+
+
+def campsite_cards(campsites, user, liked_campsite_ids):
+    """
+    Return the rendered cards for campsites, reusing cached fragments.
+
+    Only the like state differs between users with the same visibility, so
+    it is the one thing applied per request, from liked_campsite_ids.
+    """
+    viewer = _card_viewer(user)
+    keys = [campsite_card_key(campsite, *viewer) for campsite in campsites]
+    cards, misses = _assemble(campsites, keys, cache.get_many(keys), viewer, liked_campsite_ids)
+    if misses:
+        cache.set_many(misses, CATALOGUE_CACHE_TIMEOUT)
+    return cards
+
+
+async def acampsite_cards(campsites, user, liked_campsite_ids):
+    """Async version of campsite_cards()."""
+    viewer = _card_viewer(user)
+    keys = [campsite_card_key(campsite, *viewer) for campsite in campsites]
+    cards, misses = _assemble(campsites, keys, await cache.aget_many(keys), viewer, liked_campsite_ids)
+    if misses:
+        await cache.aset_many(misses, CATALOGUE_CACHE_TIMEOUT)
+    return cards
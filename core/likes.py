@@ -0,0 +1,83 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .caching import bump_catalogue_version
+from .models import Campsite, CampsiteLike
+from .sync import bump_sync_versions_on_commit
+
+# One statement flips the like and moves the counter: the DELETE removes an
+# existing like, otherwise the INSERT adds one (ON CONFLICT covers a racing
+# insert by the same user), and the UPDATE applies the difference to
+# like_count and returns the new value. All three run in a single round trip
+# and hold the campsite row lock only for that statement; the sync version is
+# taken after commit, like every other sync feed move.
+TOGGLE_LIKE_SQL = """
+WITH deleted AS (
+    DELETE FROM {like_table}
+    WHERE user_id = %(user_id)s AND campsite_id = %(campsite_id)s
+    RETURNING 1
+), inserted AS (
+    INSERT INTO {like_table} (user_id, campsite_id, created_at)
+    SELECT %(user_id)s, id, %(now)s FROM {campsite_table}
+    WHERE id = %(campsite_id)s AND NOT EXISTS (SELECT 1 FROM deleted)
+    ON CONFLICT (user_id, campsite_id) DO NOTHING
+    RETURNING 1
+)
+UPDATE {campsite_table}
+SET like_count = GREATEST(
+    like_count + (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted), 0
+)
+WHERE id = %(campsite_id)s
+RETURNING NOT EXISTS (SELECT 1 FROM deleted), like_count
+"""
+
+
+def toggle_campsite_like(user_id: int, campsite_id: int):
+    """
+    Like the campsite if the user hasn't, unlike it if they have.
+
+    Bypasses the ORM (and so the CampsiteLike signals), keeping like_count,
+    its sync version and the catalogue cache version up to date itself.
+
+    Returns:
+        (is_liked, like_count), or None if the campsite does not exist
+    """
+    quote = connection.ops.quote_name
+    sql = TOGGLE_LIKE_SQL.format(
+        like_table=quote(CampsiteLike._meta.db_table),
+        campsite_table=quote(Campsite._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'user_id': user_id, 'campsite_id': campsite_id, 'now': timezone.now()})
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    bump_sync_versions_on_commit([campsite_id])
+    transaction.on_commit(bump_catalogue_version)
+    return row[0], row[1]
+
+
+def liked_campsite_ids(user, campsite_ids):
+    """
+    Return the subset of campsite_ids the user has liked.
+
+    Scoped to the campsites being shown, so the cost doesn't grow with the
+    user's like history; served by the unique (user, campsite) index.
+    """
+    if not user.is_authenticated or not campsite_ids:
+        return set()
+    return set(
+        CampsiteLike.objects.filter(user=user, campsite_id__in=campsite_ids)
+        .values_list('campsite_id', flat=True)
+    )
+
+
+async def aliked_campsite_ids(user, campsite_ids):
+    """Async version of liked_campsite_ids()."""
+    if not user.is_authenticated or not campsite_ids:
+        return set()
+    return {
+        campsite_id async for campsite_id in
+        CampsiteLike.objects.filter(user=user, campsite_id__in=campsite_ids).values_list('campsite_id', flat=True)
+    }
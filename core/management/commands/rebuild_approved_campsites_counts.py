@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.suggestions import actual_approved_campsites_count, drifted_approved_campsites_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute User.approved_campsites_count from the approved campsites each user suggested and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report users whose stored count is wrong without updating them",
+        )
+
+    def handle(self, *args, **options):
+        drifted = drifted_approved_campsites_counts()
+
+        if options["dry_run"]:
+            for pk, username, stored, real in drifted.values_list("pk", "username", "approved_campsites_count", "actual_count"):
+                self.stdout.write(f"{pk} {username}: stored {stored}, actual {real}")
+            self.stdout.write(f"{drifted.count()} user(s) have a wrong approved campsites count.")
+            return
+
+        fixed = get_user_model().objects.filter(pk__in=drifted.values("pk")).update(
+            approved_campsites_count=actual_approved_campsites_count()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Fixed approved campsites counts on {fixed} user(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recount the campsite facet table from the campsites and fix any drift."
+
+    def handle(self, *args, **options):
+        fixed = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"Fixed {fixed} facet count(s)."))
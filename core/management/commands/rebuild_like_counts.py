@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from core.models import Campsite, CampsiteLike
+from core.sync import bump_sync_versions_on_commit
+
+
+class Command(BaseCommand):
+    help = "Recompute Campsite.like_count from the CampsiteLike table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report campsites whose stored count is wrong without updating them",
+        )
+
+    def handle(self, *args, **options):
+        counts = (
+            CampsiteLike.objects.filter(campsite=OuterRef("pk"))
+            .order_by()
+            .values("campsite")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        actual = Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+        drifted = Campsite.objects.annotate(actual_likes=actual).filter(~Q(like_count=actual))
+
+        if options["dry_run"]:
+            for pk, name, stored, real in drifted.values_list("pk", "name", "like_count", "actual_likes"):
+                self.stdout.write(f"{pk} {name}: stored {stored}, actual {real}")
+            self.stdout.write(f"{drifted.count()} campsite(s) have a wrong like count.")
+            return
+
+        with transaction.atomic():
+            drifted_ids = list(drifted.values_list("pk", flat=True))
+            fixed = Campsite.objects.filter(pk__in=drifted_ids).update(like_count=actual)
+            bump_sync_versions_on_commit(drifted_ids)
+        self.stdout.write(self.style.SUCCESS(f"Fixed like counts on {fixed} campsite(s)."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_campsite_province_campsite_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campsite',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, help_text='Parsed from map_location on save', null=True),
+        ),
+        migrations.AddField(
+            model_name='campsite',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, help_text='Parsed from map_location on save', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['latitude', 'longitude'], name='campsite_lat_lng_idx'),
+        ),
+    ]
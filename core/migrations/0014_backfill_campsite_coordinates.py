@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:48
+
+from django.db import migrations
+
+
+def backfill_coordinates(apps, schema_editor):
+    """Populate latitude/longitude from the existing map_location strings."""
+    Campsite = apps.get_model("core", "Campsite")
+    to_update = []
+    for campsite in Campsite.objects.only("pk", "map_location").iterator(chunk_size=2000):
+        try:
+            parts = (campsite.map_location or "").split(",")
+            lat = float(parts[0].strip())
+            lng = float(parts[1].strip())
+        except (ValueError, IndexError):
+            continue
+        if -90 <= lat <= 90 and -180 <= lng <= 180:
+            campsite.latitude = lat
+            campsite.longitude = lng
+            to_update.append(campsite)
+    Campsite.objects.bulk_update(to_update, ["latitude", "longitude"], batch_size=1000)
+
+
+def clear_coordinates(apps, schema_editor):
+    """Reverse operation - no-op as map_location still holds the source of the coordinates."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_campsite_latitude_longitude'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_coordinates, clear_coordinates),
+    ]
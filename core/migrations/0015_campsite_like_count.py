@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_backfill_campsite_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campsite',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of likes, maintained when CampsiteLike rows are created or deleted'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', '-is_premium', '-like_count', 'name', 'id'], name='campsite_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:58
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_counts(apps, schema_editor):
+    """Populate like_count from the existing CampsiteLike rows."""
+    Campsite = apps.get_model("core", "Campsite")
+    CampsiteLike = apps.get_model("core", "CampsiteLike")
+    counts = (
+        CampsiteLike.objects.filter(campsite=OuterRef("pk"))
+        .order_by()
+        .values("campsite")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Campsite.objects.update(
+        like_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+    )
+
+
+def reset_like_counts(apps, schema_editor):
+    """Reverse operation - no-op as the counters are recomputed from CampsiteLike on the way forward."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_campsite_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_like_counts, reset_like_counts),
+    ]
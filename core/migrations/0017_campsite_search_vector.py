@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_backfill_campsite_like_count'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.AddField(
+            model_name='campsite',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text document over name, town, province and description, refreshed on save', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='campsite_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='campsite_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['town'], name='campsite_town_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
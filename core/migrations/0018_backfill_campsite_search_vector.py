@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:01
+
+from django.contrib.postgres.lookups import Unaccent
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Populate search_vector for the existing campsites (mirrors core.search.campsite_search_vector)."""
+    Campsite = apps.get_model("core", "Campsite")
+    Campsite.objects.update(
+        search_vector=(
+            SearchVector(Unaccent("name"), weight="A", config="simple")
+            + SearchVector(Unaccent("town"), weight="B", config="simple")
+            + SearchVector(Unaccent("province"), weight="B", config="simple")
+            + SearchVector(Unaccent("description"), weight="C", config="simple")
+        )
+    )
+
+
+def clear_search_vectors(apps, schema_editor):
+    """Reverse operation - no-op as the vectors are derived from columns that are left untouched."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_campsite_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, clear_search_vectors),
+    ]
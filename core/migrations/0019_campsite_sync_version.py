@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_backfill_campsite_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE SEQUENCE core_campsite_sync_version_seq',
+            'DROP SEQUENCE core_campsite_sync_version_seq',
+        ),
+        migrations.CreateModel(
+            name='CampsiteTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('campsite_id', models.IntegerField(unique=True)),
+                ('sync_version', models.BigIntegerField(db_index=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Campsite Tombstone',
+                'verbose_name_plural': 'Campsite Tombstones',
+                'ordering': ['sync_version'],
+            },
+        ),
+        migrations.AddField(
+            model_name='campsite',
+            name='sync_version',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, help_text='Position in the delta sync feed, bumped whenever the campsite or its like count changes'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations
+from django.db.models import BigIntegerField, Func, Value
+
+
+def backfill_sync_versions(apps, schema_editor):
+    """Give every existing campsite a position in the sync feed."""
+    Campsite = apps.get_model("core", "Campsite")
+    next_version = Func(
+        Value("core_campsite_sync_version_seq"),
+        function="nextval",
+        template="%(function)s(%(expressions)s::regclass)",
+        output_field=BigIntegerField(),
+    )
+    Campsite.objects.update(sync_version=next_version)
+
+
+def clear_sync_versions(apps, schema_editor):
+    """Reverse operation - no-op as sync versions only need to grow, so there is nothing to rewind."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_campsite_sync_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sync_versions, clear_sync_versions),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_backfill_campsite_sync_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampsiteFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_approved', models.BooleanField()),
+                ('country', models.CharField(choices=[('AL', 'Albania'), ('AD', 'Andorra'), ('AT', 'Austria'), ('BY', 'Belarus'), ('BE', 'Belgium'), ('BA', 'Bosnia and Herzegovina'), ('BG', 'Bulgaria'), ('HR', 'Croatia'), ('CY', 'Cyprus'), ('CZ', 'Czech Republic'), ('DK', 'Denmark'), ('EE', 'Estonia'), ('FI', 'Finland'), ('FR', 'France'), ('DE', 'Germany'), ('GR', 'Greece'), ('HU', 'Hungary'), ('IS', 'Iceland'), ('IE', 'Ireland'), ('IT', 'Italy'), ('XK', 'Kosovo'), ('LV', 'Latvia'), ('LI', 'Liechtenstein'), ('LT', 'Lithuania'), ('LU', 'Luxembourg'), ('MT', 'Malta'), ('MD', 'Moldova'), ('MC', 'Monaco'), ('ME', 'Montenegro'), ('NL', 'Netherlands'), ('MK', 'North Macedonia'), ('NO', 'Norway'), ('PL', 'Poland'), ('PT', 'Portugal'), ('RO', 'Romania'), ('RU', 'Russia'), ('SM', 'San Marino'), ('RS', 'Serbia'), ('SK', 'Slovakia'), ('SI', 'Slovenia'), ('ES', 'Spain'), ('SE', 'Sweden'), ('CH', 'Switzerland'), ('UA', 'Ukraine'), ('GB', 'United Kingdom'), ('VA', 'Vatican City')], max_length=2)),
+                ('type', models.CharField(blank=True, choices=[('BEACH', 'Beach'), ('MOUNTAIN', 'Mountain'), ('FOREST', 'Forest'), ('CITY', 'City'), ('SPORTS', 'Sports')], max_length=20)),
+                ('province', models.CharField(blank=True, max_length=200)),
+                ('is_premium', models.BooleanField()),
+                ('campsite_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Campsite Facet Count',
+                'verbose_name_plural': 'Campsite Facet Counts',
+                'constraints': [models.UniqueConstraint(fields=('is_approved', 'country', 'type', 'province', 'is_premium'), name='unique_campsite_facet')],
+            },
+        ),
+    ]
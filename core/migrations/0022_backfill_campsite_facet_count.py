@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:17
+
+from django.db import migrations
+from django.db.models import Count
+
+FACET_KEY_FIELDS = ("is_approved", "country", "type", "province", "is_premium")
+
+
+def backfill_facet_counts(apps, schema_editor):
+    """Count the existing campsites per facet combination."""
+    Campsite = apps.get_model("core", "Campsite")
+    CampsiteFacetCount = apps.get_model("core", "CampsiteFacetCount")
+    rows = (
+        Campsite.objects.order_by()
+        .values(*FACET_KEY_FIELDS)
+        .annotate(campsite_count=Count("pk"))
+    )
+    CampsiteFacetCount.objects.bulk_create(
+        [CampsiteFacetCount(**row) for row in rows], batch_size=1000
+    )
+
+
+def clear_facet_counts(apps, schema_editor):
+    """Reverse operation - empty the table so the backfill can run again."""
+    apps.get_model("core", "CampsiteFacetCount").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_campsite_facet_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_facet_counts, clear_facet_counts),
+    ]
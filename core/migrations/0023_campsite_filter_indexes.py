@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:18
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_backfill_campsite_facet_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', 'country', '-is_premium', '-like_count', 'name', 'id'], name='campsite_country_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', 'type', '-is_premium', '-like_count', 'name', 'id'], name='campsite_type_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(models.F('is_approved'), django.db.models.functions.text.Upper('province'), models.OrderBy(models.F('is_premium'), descending=True), models.OrderBy(models.F('like_count'), descending=True), models.F('name'), models.F('id'), name='campsite_province_listing_idx'),
+        ),
+    ]
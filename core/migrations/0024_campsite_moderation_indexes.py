@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_campsite_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', 'created_at', 'id'], name='campsite_moderation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', 'country', 'created_at', 'id'], name='campsite_country_mod_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campsite',
+            index=models.Index(fields=['is_approved', 'suggested_by', 'created_at', 'id'], name='campsite_suggester_mod_idx'),
+        ),
+    ]
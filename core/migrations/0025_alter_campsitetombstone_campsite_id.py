@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_campsite_moderation_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='campsitetombstone',
+            name='campsite_id',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 
 
@@ -69,6 +73,8 @@ class Campsite(models.Model):
     town = models.CharField(max_length=200)
     description = models.TextField()
     map_location = models.CharField(max_length=500, help_text="GPS coordinates or map URL")
+    latitude = models.FloatField(null=True, blank=True, editable=False, help_text="Parsed from map_location on save")
+    longitude = models.FloatField(null=True, blank=True, editable=False, help_text="Parsed from map_location on save")
     website = models.URLField(max_length=500, blank=True)
     phone_number = models.CharField(max_length=50, blank=True)
     country = models.CharField(max_length=2, choices=COUNTRY_CHOICES)
@@ -99,46 +105,107 @@ class Campsite(models.Model):
         db_index=True,
         help_text="Premium campsites are featured at the top of listings"
     )
+    like_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of likes, maintained when CampsiteLike rows are created or deleted"
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Full-text document over name, town, province and description, refreshed on save"
+    )
+    sync_version = models.BigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Position in the delta sync feed, bumped whenever the campsite or its like count changes"
+    )
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Campsite'
         verbose_name_plural = 'Campsites'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='campsite_lat_lng_idx'),
+            # Serves the listing order (see core.pagination.CAMPSITE_LIST_ORDERING) for approved campsites
+            models.Index(
+                fields=['is_approved', '-is_premium', '-like_count', 'name', 'id'],
+                name='campsite_listing_idx',
+            ),
+            # The same order within one filter value, for the list API's country,
+            # type and province filters (premium is covered by campsite_listing_idx)
+            models.Index(
+                fields=['is_approved', 'country', '-is_premium', '-like_count', 'name', 'id'],
+                name='campsite_country_listing_idx',
+            ),
+            models.Index(
+                fields=['is_approved', 'type', '-is_premium', '-like_count', 'name', 'id'],
+                name='campsite_type_listing_idx',
+            ),
+            # province is matched case-insensitively (iexact compares UPPER())
+            models.Index(
+                F('is_approved'), Upper('province'), F('is_premium').desc(), F('like_count').desc(), F('name'), F('id'),
+                name='campsite_province_listing_idx',
+            ),
+            # Moderation queues: pending campsites by submission time, optionally
+            # for one country or suggester (see core.pagination.MODERATION_QUEUE_ORDERING)
+            models.Index(fields=['is_approved', 'created_at', 'id'], name='campsite_moderation_idx'),
+            models.Index(
+                fields=['is_approved', 'country', 'created_at', 'id'],
+                name='campsite_country_mod_idx',
+            ),
+            models.Index(
+                fields=['is_approved', 'suggested_by', 'created_at', 'id'],
+                name='campsite_suggester_mod_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='campsite_search_vector_idx'),
+            # Typo-tolerant fallback for the search box (trigram_word_similar lookups)
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='campsite_name_trgm_idx'),
+            GinIndex(fields=['town'], opclasses=['gin_trgm_ops'], name='campsite_town_trgm_idx'),
+        ]
 
     def __str__(self):
         status = "Approved" if self.is_approved else "Pending"
         return f"{self.name} - {self.get_country_display()} ({status})"
     
-    @property
-    def latitude(self):
-        """Extract latitude from map_location field (expects 'lat,lng' format)."""
-        if not self.map_location:
+    @staticmethod
+    def parse_map_location(map_location):
+        """Parse a 'lat,lng' map_location string into a (lat, lng) tuple, or None if invalid."""
+        if not map_location:
             return None
         try:
-            parts = self.map_location.split(',')
+            parts = map_location.split(',')
             if len(parts) >= 2:
                 lat = float(parts[0].strip())
-                if -90 <= lat <= 90:
-                    return lat
-        except (ValueError, AttributeError):
-            pass
-        return None
-    
-    @property
-    def longitude(self):
-        """Extract longitude from map_location field (expects 'lat,lng' format)."""
-        if not self.map_location:
-            return None
-        try:
-            parts = self.map_location.split(',')
-            if len(parts) >= 2:
                 lng = float(parts[1].strip())
-                if -180 <= lng <= 180:
-                    return lng
+                if -90 <= lat <= 90 and -180 <= lng <= 180:
+                    return lat, lng
         except (ValueError, AttributeError):
             pass
         return None
 
+    def sync_coordinates(self):
+        """Copy the coordinates parsed from map_location into the latitude/longitude columns."""
+        coords = self.parse_map_location(self.map_location)
+        self.latitude, self.longitude = coords if coords else (None, None)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.sync_coordinates()
+            if not self._state.adding:
+                # These are only changed through UPDATE expressions; writing back
+                # the in-memory values would clobber them
+                kwargs['update_fields'] = [
+                    f.name for f in self._meta.concrete_fields
+                    if not f.primary_key and f.name not in ('like_count', 'search_vector', 'sync_version')
+                ]
+        elif 'map_location' in update_fields:
+            self.sync_coordinates()
+            kwargs['update_fields'] = set(update_fields) | {'latitude', 'longitude'}
+        super().save(*args, **kwargs)
+
 
 class CampsiteLike(models.Model):
     """Model representing a user's like of a campsite."""
@@ -169,6 +236,50 @@ class CampsiteLike(models.Model):
         return f"{self.user.username} likes {self.campsite.name}"
 
 
+class CampsiteTombstone(models.Model):
+    """Record of a deleted campsite, so delta sync clients can drop their copy."""
+    campsite_id = models.BigIntegerField(unique=True)
+    sync_version = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['sync_version']
+        verbose_name = 'Campsite Tombstone'
+        verbose_name_plural = 'Campsite Tombstones'
+
+    def __str__(self):
+        return f"Campsite {self.campsite_id} deleted at {self.deleted_at}"
+
+
+class CampsiteFacetCount(models.Model):
+    """
+    Number of campsites sharing one combination of filterable values.
+
+    Maintained incrementally as campsites are saved and deleted, so facet
+    counts for any filter combination are summed from this small table
+    instead of counted over the campsites.
+    """
+    is_approved = models.BooleanField()
+    country = models.CharField(max_length=2, choices=Campsite.COUNTRY_CHOICES)
+    type = models.CharField(max_length=20, choices=Campsite.TYPE_CHOICES, blank=True)
+    province = models.CharField(max_length=200, blank=True)
+    is_premium = models.BooleanField()
+    campsite_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_approved', 'country', 'type', 'province', 'is_premium'],
+                name='unique_campsite_facet'
+            ),
+        ]
+        verbose_name = 'Campsite Facet Count'
+        verbose_name_plural = 'Campsite Facet Counts'
+
+    def __str__(self):
+        return f"{self.country}/{self.type or '-'}/{self.province or '-'}: {self.campsite_count}"
+
+
 class Product(models.Model):
     """Model representing a camping product available for purchase."""
     
@@ -0,0 +1,101 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+# Listing order shared by the campsites page and the list API. The trailing id
+# makes it a total order, which keyset pagination needs.
+CAMPSITE_LIST_ORDERING = ('-is_premium', '-like_count', 'name', 'id')
+
+
+# Moderation queues list pending campsites by submission time, oldest or
+# newest first; id breaks ties between suggestions submitted together.
+MODERATION_QUEUE_ORDERING = ('created_at', 'id')
+
+
+def _encode_position(position) -> str:
+    raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_position(cursor: str):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+
+def encode_campsite_cursor(campsite) -> str:
+    """Encode the listing position of a campsite (instance or values() row) as an opaque cursor."""
+    if isinstance(campsite, dict):
+        position = [bool(campsite['is_premium']), int(campsite['like_count'] or 0), campsite['name'], campsite['id']]
+    else:
+        position = [bool(campsite.is_premium), int(campsite.like_count or 0), campsite.name, campsite.pk]
+    return _encode_position(position)
+
+
+def decode_campsite_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_campsite_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        is_premium, like_count, name, pk = _decode_position(cursor)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor.')
+    if not (isinstance(is_premium, bool) and isinstance(like_count, int)
+            and isinstance(name, str) and isinstance(pk, int)):
+        raise ValueError('Invalid cursor.')
+    return is_premium, like_count, name, pk
+
+
+def campsites_after(qs, cursor: str):
+    """
+    Filter a queryset ordered by CAMPSITE_LIST_ORDERING to the rows after a cursor.
+
+    The queryset must expose like_count. Instead of an OFFSET, the position is
+    expressed as a row-value comparison over (is_premium, like_count, name, id).
+    """
+    is_premium, like_count, name, pk = decode_campsite_cursor(cursor)
+    return qs.filter(
+        Q(is_premium__lt=is_premium)
+        | Q(is_premium=is_premium, like_count__lt=like_count)
+        | Q(is_premium=is_premium, like_count=like_count, name__gt=name)
+        | Q(is_premium=is_premium, like_count=like_count, name=name, pk__gt=pk)
+    )
+
+
+def encode_moderation_cursor(campsite) -> str:
+    """Encode the moderation queue position of a campsite as an opaque cursor."""
+    return _encode_position([campsite.created_at.isoformat(), campsite.pk])
+
+
+def decode_moderation_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_moderation_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, pk = _decode_position(cursor)
+        created_at = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor.')
+    if not isinstance(pk, int) or created_at.tzinfo is None:
+        raise ValueError('Invalid cursor.')
+    return created_at, pk
+
+
+def campsites_submitted_after(qs, cursor: str, newest_first=False):
+    """
+    Filter a queryset in moderation queue order to the rows after a cursor.
+
+    Like campsites_after(), the position is a comparison over (created_at, id)
+    rather than an OFFSET, so later pages cost the same as the first.
+    """
+    created_at, pk = decode_moderation_cursor(cursor)
+    if newest_first:
+        return qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    return qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
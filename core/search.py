@@ -0,0 +1,59 @@
+import re
+
+from django.contrib.postgres.lookups import Unaccent
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db.models import F, Q, Value
+
+# Campsite text is multilingual, so no language-specific stemming is applied
+SEARCH_CONFIG = 'simple'
+
+# Fields that feed Campsite.search_vector; saving any of them refreshes it
+SEARCH_FIELDS = ('name', 'town', 'province', 'description')
+
+# Trigram matching on very short input matches almost everything
+TRIGRAM_MIN_LENGTH = 3
+
+
+def campsite_search_vector():
+    """Weighted, accent-insensitive tsvector expression over a campsite's text fields."""
+    return (
+        SearchVector(Unaccent('name'), weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Unaccent('town'), weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Unaccent('province'), weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Unaccent('description'), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def build_search_query(text: str):
+    """
+    Turn free text into a prefix tsquery, so partially typed words still match.
+
+    Returns None if the text contains no searchable words.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    raw = ' & '.join(f'{word}:*' for word in words)
+    return SearchQuery(Unaccent(Value(raw)), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_campsites(qs, text: str, rank: bool = False):
+    """
+    Filter a campsite queryset by free text.
+
+    Full-text matches on name, town, province and description come from the
+    search_vector column; a trigram similarity match on name and town catches
+    typos. With rank=True the queryset is annotated with search_rank.
+    """
+    query = build_search_query(text)
+    condition = Q(search_vector=query) if query is not None else Q(pk__in=[])
+    if len(text) >= TRIGRAM_MIN_LENGTH:
+        condition |= Q(name__trigram_word_similar=text) | Q(town__trigram_word_similar=text)
+    qs = qs.filter(condition)
+
+    if rank:
+        score = TrigramWordSimilarity(text, 'name')
+        if query is not None:
+            score = SearchRank(F('search_vector'), query) + score
+        qs = qs.annotate(search_rank=score)
+    return qs
@@ -0,0 +1,134 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import bump_catalogue_version
+from .facets import FACET_KEY_FIELDS, adjust_facet_counts, facet_key
+from .models import Campsite, CampsiteLike, CampsiteTombstone
+from .search import SEARCH_FIELDS, campsite_search_vector
+from .spatial import campsite_index
+from .suggestions import adjust_approved_campsites_counts, approved_suggester
+from .sync import NextSyncVersion, bump_sync_versions_on_commit
+
+
+@receiver(post_save, sender=Campsite)
+@receiver(post_delete, sender=Campsite)
+def invalidate_campsite_index(sender, **kwargs):
+    """
+    Drop the in-memory spatial index once a campsite change commits.
+
+    Invalidating earlier would let a concurrent reader rebuild the index from
+    the pre-commit data and keep that stale copy until the next write.
+    """
+    transaction.on_commit(campsite_index.invalidate)
+
+
+@receiver(post_save, sender=Campsite)
+def update_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Recompute the full-text search column when a campsite's text changes."""
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    Campsite.objects.filter(pk=instance.pk).update(search_vector=campsite_search_vector())
+
+
+@receiver(post_save, sender=CampsiteLike)
+def increment_like_count(sender, instance, created, **kwargs):
+    """Bump the campsite's denormalized like counter when a like is added."""
+    if created:
+        Campsite.objects.filter(pk=instance.campsite_id).update(like_count=F('like_count') + 1)
+        bump_sync_versions_on_commit([instance.campsite_id])
+
+
+@receiver(post_delete, sender=CampsiteLike)
+def decrement_like_count(sender, instance, **kwargs):
+    """Lower the campsite's denormalized like counter when a like is removed."""
+    Campsite.objects.filter(pk=instance.campsite_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+    bump_sync_versions_on_commit([instance.campsite_id])
+
+
+@receiver(post_save, sender=Campsite)
+@receiver(post_delete, sender=Campsite)
+@receiver(post_save, sender=CampsiteLike)
+@receiver(post_delete, sender=CampsiteLike)
+def invalidate_catalogue_cache(sender, **kwargs):
+    """Bump the catalogue version once the write commits, expiring cached reads."""
+    transaction.on_commit(bump_catalogue_version)
+
+
+@receiver(post_save, sender=Campsite)
+def bump_sync_version(sender, instance, **kwargs):
+    """Move the campsite to the head of the delta sync feed."""
+    bump_sync_versions_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Campsite)
+def record_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone so delta sync clients learn about the deletion."""
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: CampsiteTombstone.objects.create(campsite_id=pk, sync_version=NextSyncVersion())
+    )
+
+
+# Stored values the post_save handlers below compare against to move denormalized counts
+COUNTED_FIELDS = FACET_KEY_FIELDS + ('suggested_by',)
+
+
+@receiver(pre_save, sender=Campsite)
+def remember_counted_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Read the stored facet values and suggester before an update, so post_save can move the counts."""
+    instance._stored_counted_fields = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        return
+    instance._stored_counted_fields = (
+        Campsite.objects.filter(pk=instance.pk).values(*COUNTED_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Campsite)
+def update_facet_counts(sender, instance, created, raw=False, **kwargs):
+    """Move the campsite's count in the facet table to its new filter values."""
+    if raw:
+        return
+    new_key = facet_key(instance)
+    if created:
+        adjust_facet_counts({new_key: 1})
+        return
+    stored = getattr(instance, '_stored_counted_fields', None)
+    if stored is None:
+        return
+    old_key = tuple(stored[field] for field in FACET_KEY_FIELDS)
+    if old_key != new_key:
+        adjust_facet_counts({old_key: -1, new_key: 1})
+
+
+@receiver(post_delete, sender=Campsite)
+def remove_from_facet_counts(sender, instance, **kwargs):
+    """Drop a deleted campsite from the facet table."""
+    adjust_facet_counts({facet_key(instance): -1})
+
+
+@receiver(post_save, sender=Campsite)
+def update_approved_campsites_counts(sender, instance, created, raw=False, **kwargs):
+    """Move the campsite between its suggester's approved count and none as approval or suggester change."""
+    if raw:
+        return
+    new_suggester = approved_suggester(instance)
+    if created:
+        old_suggester = None
+    else:
+        stored = getattr(instance, '_stored_counted_fields', None)
+        if stored is None:
+            return
+        old_suggester = stored['suggested_by'] if stored['is_approved'] else None
+    if old_suggester != new_suggester:
+        adjust_approved_campsites_counts({old_suggester: -1, new_suggester: 1})
+
+
+@receiver(post_delete, sender=Campsite)
+def remove_from_approved_campsites_counts(sender, instance, **kwargs):
+    """A deleted approved suggestion no longer counts towards auto-approval."""
+    adjust_approved_campsites_counts({approved_suggester(instance): -1})
@@ -0,0 +1,229 @@
+import heapq
+import math
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .utils import coordinate_arrays, haversine_distances
+
+# Campsites are bucketed into a grid of CELL_SIZE_DEG x CELL_SIZE_DEG cells
+CELL_SIZE_DEG = 0.5
+KM_PER_DEG_LAT = 111.32
+
+# Writes in other worker processes can't reach this process's signal handlers,
+# so an index older than this is rebuilt on next use regardless.
+INDEX_MAX_AGE_SECONDS = 300
+
+Entry = Tuple[int, float, float, bool, str]  # (pk, lat, lng, is_approved, country)
+
+
+class Bucket(NamedTuple):
+    """The entries of one grid cell, with their columns as arrays for batch distance checks."""
+    entries: List[Entry]
+    ids: np.ndarray
+    lats: np.ndarray
+    lngs: np.ndarray
+    approved: np.ndarray
+
+    @classmethod
+    def from_entries(cls, entries: List[Entry]) -> 'Bucket':
+        ids, lats, lngs = coordinate_arrays((pk, lat, lng) for pk, lat, lng, _, _ in entries)
+        approved = np.fromiter((entry[3] for entry in entries), dtype=bool, count=len(entries))
+        return cls(entries, ids, lats, lngs, approved)
+
+
+def _candidates(lat: float, lng: float, buckets: List[Bucket], approved_only: bool, exclude_ids=()):
+    """Concatenate buckets into (ids, distances_km) arrays, dropping unapproved and excluded entries."""
+    ids = np.concatenate([bucket.ids for bucket in buckets])
+    distances = haversine_distances(
+        lat, lng,
+        np.concatenate([bucket.lats for bucket in buckets]),
+        np.concatenate([bucket.lngs for bucket in buckets]),
+    )
+    keep = np.ones(len(ids), dtype=bool)
+    if approved_only:
+        keep &= np.concatenate([bucket.approved for bucket in buckets])
+    if exclude_ids:
+        keep &= ~np.isin(ids, list(exclude_ids))
+    return ids[keep], distances[keep]
+
+
+class CampsiteSpatialIndex:
+    """
+    Process-local grid index over campsite coordinates.
+
+    The index is built lazily on first query, dropped by the Campsite
+    post_save/post_delete signal handlers and answers radius and k-nearest
+    queries without touching the database. Distances are computed per batch
+    of cells with the vectorized Haversine rather than one entry at a time.
+    """
+
+    def __init__(self, cell_size_deg: float = CELL_SIZE_DEG):
+        self.cell_size_deg = cell_size_deg
+        self._lock = threading.Lock()
+        self._buckets: Optional[Dict[Tuple[int, int], Bucket]] = None
+        self._size = 0
+        self._built_at = 0.0
+        self.generation = 0
+
+    def invalidate(self):
+        """Drop the index so the next query rebuilds it."""
+        with self._lock:
+            self._buckets = None
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size_deg), math.floor(lng / self.cell_size_deg)
+
+    def _get_buckets(self) -> Dict[Tuple[int, int], Bucket]:
+        buckets = self._buckets
+        if buckets is not None and time.monotonic() - self._built_at < INDEX_MAX_AGE_SECONDS:
+            return buckets
+
+        with self._lock:
+            if self._buckets is not None and time.monotonic() - self._built_at < INDEX_MAX_AGE_SECONDS:
+                return self._buckets
+
+            from .models import Campsite
+
+            rows = Campsite.objects.filter(
+                latitude__isnull=False,
+                longitude__isnull=False,
+            ).values_list("pk", "latitude", "longitude", "is_approved", "country")
+
+            cells = {}
+            for entry in rows.iterator(chunk_size=2000):
+                cells.setdefault(self._cell(entry[1], entry[2]), []).append(entry)
+            buckets = {cell: Bucket.from_entries(entries) for cell, entries in cells.items()}
+
+            self._buckets = buckets
+            self._size = sum(len(bucket.entries) for bucket in buckets.values())
+            self._built_at = time.monotonic()
+            self.generation += 1
+            return buckets
+
+    def snapshot(self) -> Tuple[int, List[Entry]]:
+        """
+        Return every indexed entry along with the build generation it came from.
+
+        Consumers that derive their own structures from the index (e.g. the
+        map cluster pyramid) compare generations to know when to rebuild.
+        """
+        buckets = self._get_buckets()
+        generation = self.generation
+        return generation, [entry for bucket in buckets.values() for entry in bucket.entries]
+
+    def within_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        approved_only: bool = True,
+    ) -> List[Tuple[int, float]]:
+        """
+        Find campsites within radius_km of a point.
+
+        Returns:
+            List of (campsite_id, distance_km) tuples sorted by distance
+        """
+        buckets = self._get_buckets()
+
+        lat_delta = radius_km / KM_PER_DEG_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        lng_delta = radius_km / (KM_PER_DEG_LAT * cos_lat)
+
+        min_row, min_col = self._cell(lat - lat_delta, lng - lng_delta)
+        max_row, max_col = self._cell(lat + lat_delta, lng + lng_delta)
+
+        in_reach = [
+            buckets[(row, col)]
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+            if (row, col) in buckets
+        ]
+        if not in_reach:
+            return []
+
+        ids, distances = _candidates(lat, lng, in_reach, approved_only)
+        within = distances <= radius_km
+        ids, distances = ids[within], distances[within]
+        order = np.argsort(distances, kind='stable')
+        return list(zip(ids[order].tolist(), distances[order].tolist()))
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        max_km: Optional[float] = None,
+        approved_only: bool = True,
+        exclude_ids=(),
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the k campsites closest to a point.
+
+        Cells are scanned in growing square rings around the origin until the
+        nearest unscanned ring cannot contain anything closer than the current
+        k-th result (or is beyond max_km).
+
+        Returns:
+            List of (campsite_id, distance_km) tuples sorted by distance
+        """
+        if k <= 0:
+            return []
+
+        buckets = self._get_buckets()
+        if not buckets:
+            return []
+
+        origin_row, origin_col = self._cell(lat, lng)
+        max_ring = math.ceil(360 / self.cell_size_deg)
+        scanned = 0
+
+        # Max-heap of the best k so far, stored as (-distance, pk)
+        best: List[Tuple[float, int]] = []
+
+        for ring in range(max_ring + 1):
+            ring_buckets = []
+            for row in range(origin_row - ring, origin_row + ring + 1):
+                on_edge = row in (origin_row - ring, origin_row + ring)
+                cols = range(origin_col - ring, origin_col + ring + 1) if on_edge else (origin_col - ring, origin_col + ring)
+                for col in cols:
+                    bucket = buckets.get((row, col))
+                    if bucket is not None:
+                        ring_buckets.append(bucket)
+                        scanned += len(bucket.entries)
+
+            if ring_buckets:
+                ids, distances = _candidates(lat, lng, ring_buckets, approved_only, exclude_ids)
+                if max_km is not None:
+                    in_range = distances <= max_km
+                    ids, distances = ids[in_range], distances[in_range]
+                # Only this ring's k closest can make it into the overall k best
+                if len(ids) > k:
+                    closest = np.argpartition(distances, k - 1)[:k]
+                    ids, distances = ids[closest], distances[closest]
+                for pk, distance in zip(ids.tolist(), distances.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, pk))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, pk))
+
+            # Anything outside this ring is at least `ring` cells away from the origin.
+            # Use the shortest degree length within reach as a conservative bound.
+            reach_lat = min(abs(lat) + (ring + 1) * self.cell_size_deg, 89.9)
+            min_deg_km = KM_PER_DEG_LAT * math.cos(math.radians(reach_lat))
+            ring_floor_km = ring * self.cell_size_deg * min_deg_km
+
+            if scanned >= self._size:
+                break
+            if max_km is not None and ring_floor_km > max_km:
+                break
+            if len(best) == k and ring_floor_km > -best[0][0]:
+                break
+
+        return sorted(((pk, -neg) for neg, pk in best), key=lambda item: item[1])
+
+
+campsite_index = CampsiteSpatialIndex()
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Campsite
+
+
+def approved_suggester(campsite):
+    """The user id a campsite counts towards in approved_campsites_count, or None."""
+    return campsite.suggested_by_id if campsite.is_approved else None
+
+
+def adjust_approved_campsites_counts(deltas):
+    """Apply {user id: change} to User.approved_campsites_count."""
+    User = get_user_model()
+    for user_id, n in deltas.items():
+        if user_id is None or not n:
+            continue
+        User.objects.filter(pk=user_id).update(
+            approved_campsites_count=Greatest(F('approved_campsites_count') + n, 0)
+        )
+
+
+def actual_approved_campsites_count():
+    """Expression counting a user's approved suggestions from the campsites, for annotate()/update()."""
+    counts = (
+        Campsite.objects.filter(suggested_by=OuterRef('pk'), is_approved=True)
+        .order_by()
+        .values('suggested_by')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def drifted_approved_campsites_counts():
+    """Users whose stored approved_campsites_count disagrees with their campsites, annotated with actual_count."""
+    actual = actual_approved_campsites_count()
+    return get_user_model().objects.annotate(actual_count=actual).filter(~Q(approved_campsites_count=actual))
@@ -0,0 +1,72 @@
+import base64
+import json
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Func, Max, Value
+
+from .models import Campsite, CampsiteTombstone
+
+# Shared by Campsite.sync_version and CampsiteTombstone.sync_version, so one
+# number orders every change in the delta sync feed
+SYNC_SEQUENCE = 'core_campsite_sync_version_seq'
+
+
+class NextSyncVersion(Func):
+    """nextval() on the sync sequence, for use in UPDATE/INSERT expressions."""
+    function = 'nextval'
+    template = '%(function)s(%(expressions)s::regclass)'
+    output_field = BigIntegerField()
+
+    def __init__(self):
+        super().__init__(Value(SYNC_SEQUENCE))
+
+
+def bump_sync_versions_on_commit(campsite_ids):
+    """
+    Move the campsites to the head of the delta sync feed once the write commits.
+
+    The version is taken after commit, in its own statement, so a slow
+    transaction can't commit a version lower than one a client has already
+    synced past.
+    """
+    campsite_ids = list(campsite_ids)
+    transaction.on_commit(
+        lambda: Campsite.objects.filter(pk__in=campsite_ids).update(sync_version=NextSyncVersion())
+    )
+
+
+def latest_sync_version() -> int:
+    """
+    The newest version in the sync feed, or 0 before any change.
+
+    Every campsite edit, like and deletion takes a new version, so this moves
+    whenever the catalogue does. Both reads are served by the sync_version
+    indexes.
+    """
+    return max(
+        Campsite.objects.aggregate(version=Max('sync_version'))['version'] or 0,
+        CampsiteTombstone.objects.aggregate(version=Max('sync_version'))['version'] or 0,
+    )
+
+
+def encode_sync_cursor(version: int) -> str:
+    """Encode a position in the change feed as an opaque cursor."""
+    raw = json.dumps({'v': version}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_sync_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_sync_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        version = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))['v']
+    except (TypeError, ValueError, KeyError, UnicodeError):
+        raise ValueError('Invalid cursor.')
+    if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+        raise ValueError('Invalid cursor.')
+    return version
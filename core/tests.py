@@ -1,3 +1,281 @@
-from django.test import TestCase
+import threading
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .admin import approve_campsites
+from .facets import FACET_KEY_FIELDS, live_facet_rows, stored_facet_rows
+from .likes import toggle_campsite_like
+from .models import Campsite, CampsiteFacetCount, CampsiteLike
+from .pagination import (
+    CAMPSITE_LIST_ORDERING,
+    MODERATION_QUEUE_ORDERING,
+    campsites_after,
+    campsites_submitted_after,
+    encode_campsite_cursor,
+    encode_moderation_cursor,
+)
+
+User = get_user_model()
+
+
+def create_campsite(**kwargs):
+    fields = {
+        'name': 'Camping Test',
+        'town': 'Testville',
+        'description': 'A campsite for the tests.',
+        'map_location': '41.3851, 2.1734',
+        'country': 'ES',
+        'is_approved': True,
+    }
+    fields.update(kwargs)
+    return Campsite.objects.create(**fields)
+
+
+class ToggleLikeConcurrencyTests(TransactionTestCase):
+    """toggle_campsite_like() keeps like_count exact under concurrent toggles."""
+
+    def run_concurrently(self, jobs):
+        """Run each (user_id, campsite_id, toggles) job in its own thread, each on its own connection."""
+        errors = []
+        barrier = threading.Barrier(len(jobs))
+
+        def work(user_id, campsite_id, toggles):
+            try:
+                barrier.wait()
+                for _ in range(toggles):
+                    toggle_campsite_like(user_id, campsite_id)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=work, args=job) for job in jobs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def assertLikeCountMatches(self, campsite):
+        campsite.refresh_from_db()
+        self.assertEqual(campsite.like_count, CampsiteLike.objects.filter(campsite=campsite).count())
+
+    def test_concurrent_toggles_by_different_users(self):
+        campsite = create_campsite()
+        users = [User.objects.create_user(username=f'liker{i}', password='x') for i in range(8)]
+        # Odd toggle counts leave a like behind, even ones remove it again
+        self.run_concurrently([(user.pk, campsite.pk, 5 if i % 2 else 4) for i, user in enumerate(users)])
+
+        self.assertLikeCountMatches(campsite)
+        self.assertEqual(campsite.like_count, 4)
+
+    def test_concurrent_toggles_by_the_same_user(self):
+        campsite = create_campsite()
+        user = User.objects.create_user(username='liker', password='x')
+        self.run_concurrently([(user.pk, campsite.pk, 3) for _ in range(6)])
+
+        self.assertLikeCountMatches(campsite)
+        self.assertIn(campsite.like_count, (0, 1))
+
+
+class KeysetPaginationTests(TestCase):
+    """Walking the keyset cursors page by page visits every row once, in order."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Ties on every ordering column but the last, so the id tiebreaker matters
+        for i in range(23):
+            create_campsite(
+                name=f'Camping {i % 4}',
+                is_premium=i % 5 == 0,
+                is_approved=i % 3 != 0,
+                country='ES' if i % 2 else 'FR',
+            )
+        Campsite.objects.filter(pk__in=Campsite.objects.order_by('pk').values('pk')[:6]).update(like_count=2)
+        # Submission times collide in pairs
+        base = timezone.now() - timedelta(days=1)
+        for i, pk in enumerate(Campsite.objects.order_by('pk').values_list('pk', flat=True)):
+            Campsite.objects.filter(pk=pk).update(created_at=base + timedelta(minutes=i // 2))
+
+    def walk(self, qs, page_size, after, encode):
+        """Collect the ids of every page, each one continuing from the previous page's cursor."""
+        ids, cursor = [], None
+        while True:
+            page = list((after(qs, cursor) if cursor else qs)[:page_size])
+            ids.extend(campsite.pk for campsite in page)
+            if len(page) < page_size:
+                return ids
+            cursor = encode(page[-1])
+
+    def test_listing_cursor_pages(self):
+        qs = Campsite.objects.filter(is_approved=True).order_by(*CAMPSITE_LIST_ORDERING)
+        expected = list(qs.values_list('pk', flat=True))
+        for page_size in (1, 4, 7, len(expected)):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.walk(qs, page_size, campsites_after, encode_campsite_cursor), expected)
+
+    def test_listing_cursor_pages_from_values_rows(self):
+        qs = Campsite.objects.filter(is_approved=True).order_by(*CAMPSITE_LIST_ORDERING)
+        first = list(qs.values('is_premium', 'like_count', 'name', 'id')[:5])
+        rest = campsites_after(qs, encode_campsite_cursor(first[-1]))
+        self.assertEqual(
+            [row['id'] for row in first] + list(rest.values_list('pk', flat=True)),
+            list(qs.values_list('pk', flat=True)),
+        )
+
+    def test_moderation_cursor_pages(self):
+        pending = Campsite.objects.filter(is_approved=False)
+        for newest_first in (False, True):
+            ordering = [f'-{field}' for field in MODERATION_QUEUE_ORDERING] if newest_first else MODERATION_QUEUE_ORDERING
+            for qs in (pending.order_by(*ordering), pending.filter(country='ES').order_by(*ordering)):
+                expected = list(qs.values_list('pk', flat=True))
+
+                def after(qs, cursor):
+                    return campsites_submitted_after(qs, cursor, newest_first=newest_first)
+
+                for page_size in (1, 2, 3):
+                    with self.subTest(newest_first=newest_first, page_size=page_size):
+                        self.assertEqual(self.walk(qs, page_size, after, encode_moderation_cursor), expected)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is PostgreSQL-specific')
+class KeysetIndexTests(TestCase):
+    """The keyset pages are served by the composite indexes rather than a sort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(10):
+            create_campsite(
+                name=f'Camping {i}',
+                is_approved=i % 2 == 0,
+                is_premium=i % 3 == 0,
+                type='BEACH' if i % 4 else '',
+                province='Catalonia' if i % 3 else 'Valencia',
+            )
+
+    def setUp(self):
+        # The test table is tiny, so the planner would rather scan it and sort;
+        # ruling those plans out shows which index can serve the page in order
+        with connection.cursor() as cursor:
+            for setting in ('enable_seqscan', 'enable_bitmapscan', 'enable_sort'):
+                cursor.execute(f'SET LOCAL {setting} = off')
+
+    def assertUsesIndex(self, qs, index_name):
+        plan = qs.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_listing_page_uses_listing_index(self):
+        qs = Campsite.objects.filter(is_approved=True).order_by(*CAMPSITE_LIST_ORDERING)
+        cursor = encode_campsite_cursor(qs.first())
+        self.assertUsesIndex(campsites_after(qs, cursor)[:30], 'campsite_listing_idx')
+
+    def test_country_listing_page_uses_country_index(self):
+        qs = Campsite.objects.filter(is_approved=True, country='ES').order_by(*CAMPSITE_LIST_ORDERING)
+        cursor = encode_campsite_cursor(qs.first())
+        self.assertUsesIndex(campsites_after(qs, cursor)[:30], 'campsite_country_listing_idx')
+
+    def test_type_listing_page_uses_type_index(self):
+        qs = Campsite.objects.filter(is_approved=True, type='BEACH').order_by(*CAMPSITE_LIST_ORDERING)
+        cursor = encode_campsite_cursor(qs.first())
+        self.assertUsesIndex(campsites_after(qs, cursor)[:30], 'campsite_type_listing_idx')
+
+    def test_province_listing_page_uses_province_index(self):
+        # The index is on UPPER(province), which is what iexact compares
+        qs = Campsite.objects.filter(is_approved=True, province__iexact='catalonia').order_by(*CAMPSITE_LIST_ORDERING)
+        cursor = encode_campsite_cursor(qs.first())
+        self.assertUsesIndex(campsites_after(qs, cursor)[:30], 'campsite_province_listing_idx')
+
+    def test_premium_listing_page_uses_listing_index(self):
+        qs = Campsite.objects.filter(is_approved=True, is_premium=False).order_by(*CAMPSITE_LIST_ORDERING)
+        cursor = encode_campsite_cursor(qs.first())
+        self.assertUsesIndex(campsites_after(qs, cursor)[:30], 'campsite_listing_idx')
+
+    def test_moderation_page_uses_moderation_index(self):
+        qs = Campsite.objects.filter(is_approved=False).order_by(*MODERATION_QUEUE_ORDERING)
+        cursor = encode_moderation_cursor(qs.first())
+        self.assertUsesIndex(campsites_submitted_after(qs, cursor)[:26], 'campsite_moderation_idx')
+
+    def test_country_moderation_page_uses_country_index(self):
+        qs = Campsite.objects.filter(is_approved=False, country='ES').order_by(
+            *[f'-{field}' for field in MODERATION_QUEUE_ORDERING]
+        )
+        cursor = encode_moderation_cursor(qs.first())
+        self.assertUsesIndex(
+            campsites_submitted_after(qs, cursor, newest_first=True)[:26], 'campsite_country_mod_idx'
+        )
+
+
+class FacetCountTests(TestCase):
+    """The facet table follows campsite writes without a recount."""
+
+    def stored_counts(self):
+        return {
+            tuple(row[:-1]): row[-1]
+            for row in CampsiteFacetCount.objects.filter(campsite_count__gt=0).values_list(*FACET_KEY_FIELDS, 'campsite_count')
+        }
+
+    def actual_counts(self):
+        return {
+            tuple(row[:-1]): row[-1]
+            for row in Campsite.objects.order_by().values_list(*FACET_KEY_FIELDS).annotate(total=Count('pk'))
+        }
+
+    def assertFacetsMatch(self):
+        self.assertEqual(self.stored_counts(), self.actual_counts())
+        for approved_only in (True, False):
+            visible = Campsite.objects.filter(is_approved=True) if approved_only else Campsite.objects.all()
+            self.assertCountEqual(stored_facet_rows(approved_only), live_facet_rows(visible))
+
+    def test_create(self):
+        create_campsite(country='ES', type='BEACH', province='Catalonia')
+        create_campsite(country='ES', type='BEACH', province='Catalonia')
+        create_campsite(country='FR', is_approved=False)
+        self.assertEqual(self.stored_counts()[(True, 'ES', 'BEACH', 'Catalonia', False)], 2)
+        self.assertFacetsMatch()
+
+    def test_save_moves_the_count(self):
+        campsite = create_campsite(country='ES', province='Catalonia')
+        create_campsite(country='ES', province='Catalonia')
+
+        campsite.country = 'PT'
+        campsite.province = ''
+        campsite.is_premium = True
+        campsite.save()
+        self.assertFacetsMatch()
+
+        # Saves that leave the facet fields alone don't touch the table
+        campsite.name = 'Renamed'
+        campsite.save(update_fields=['name'])
+        campsite.description = 'Updated'
+        campsite.save()
+        self.assertFacetsMatch()
+
+    def test_delete(self):
+        campsite = create_campsite(country='ES')
+        create_campsite(country='ES')
+        campsite.delete()
+        self.assertEqual(self.stored_counts()[(True, 'ES', '', '', False)], 1)
+
+        Campsite.objects.all().delete()
+        self.assertEqual(self.stored_counts(), {})
+
+    def test_admin_approve_action(self):
+        pending = [create_campsite(country='ES', is_approved=False) for _ in range(3)]
+        create_campsite(country='ES')
+        approved_already = create_campsite(country='FR')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_campsites(
+                mock.Mock(), None, Campsite.objects.filter(pk__in=[pending[0].pk, pending[1].pk, approved_already.pk])
+            )
+        self.assertEqual(self.stored_counts()[(True, 'ES', '', '', False)], 3)
+        self.assertEqual(self.stored_counts()[(False, 'ES', '', '', False)], 1)
+        self.assertFacetsMatch()
@@ -3,6 +3,7 @@ import base64
 import math
 from functools import lru_cache
 from typing import Optional, Tuple
+import numpy as np
 from imagekitio import ImageKit
 from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
 
@@ -255,10 +256,16 @@ def parse_lat_lng(source) -> Optional[Tuple[float, float]]:
     return None
 
 
+EARTH_RADIUS_KM = 6371.0
+
+
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the great circle distance between two points on Earth using Haversine formula.
     
+    Scalar counterpart of haversine_distances; kept on plain math because
+    per-call NumPy overhead dominates for a single pair.
+    
     Args:
         lat1: Latitude of first point in degrees
         lon1: Longitude of first point in degrees
@@ -268,8 +275,6 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in kilometers
     """
-    R = 6371.0  # Earth's radius in kilometers
-    
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
@@ -278,54 +283,64 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     
-    return R * c
+    return EARTH_RADIUS_KM * c
+
+
+def _haversine(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Vectorized Haversine over broadcastable arrays of degrees."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lng2) - np.radians(lng1)
+    
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
 
 
-def get_campsites_within_radius(center_campsite, radius_km: float, base_qs):
+def haversine_distances(lat: float, lng: float, lats, lngs) -> np.ndarray:
     """
-    Get campsites within a specified radius of a center campsite.
+    Calculate distances from one origin to many points.
     
     Args:
-        center_campsite: Campsite instance to use as center point
-        radius_km: Radius in kilometers
-        base_qs: Base queryset to filter from
+        lat: Latitude of the origin in degrees
+        lng: Longitude of the origin in degrees
+        lats: Array-like of point latitudes in degrees
+        lngs: Array-like of point longitudes in degrees
         
     Returns:
-        Queryset of campsites within the radius
+        1-D array of distances in kilometers, aligned with lats/lngs
     """
-    center = parse_lat_lng(center_campsite)
-    if not center:
-        return base_qs.none()
-    
-    lat0, lng0 = center
-    
-    # Bounding box approximation to reduce candidate set
-    # 1 degree of latitude ≈ 111.32 km
-    lat_delta = radius_km / 111.32
-    # 1 degree of longitude varies by latitude
-    cos_lat0 = max(math.cos(math.radians(lat0)), 1e-6)
-    lng_delta = radius_km / (111.32 * cos_lat0)
-    
-    min_lat = lat0 - lat_delta
-    max_lat = lat0 + lat_delta
-    min_lng = lng0 - lng_delta
-    max_lng = lng0 + lng_delta
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    return _haversine(lat, lng, lats, lngs)
+
+
+def pairwise_haversine_distances(origin_lats, origin_lngs, lats, lngs) -> np.ndarray:
+    """
+    Calculate the distance matrix between many origins and many points.
     
-    # Filter candidates within bounding box and check exact distance
-    ids = []
-    for cs in base_qs:
-        coords = parse_lat_lng(cs)
-        if not coords:
-            continue
-        
-        lat, lng = coords
-        
-        # Quick bounding box check
-        if lat < min_lat or lat > max_lat or lng < min_lng or lng > max_lng:
-            continue
+    Args:
+        origin_lats: Array-like of M origin latitudes in degrees
+        origin_lngs: Array-like of M origin longitudes in degrees
+        lats: Array-like of N point latitudes in degrees
+        lngs: Array-like of N point longitudes in degrees
         
-        # Exact distance check
-        if calculate_distance(lat0, lng0, lat, lng) <= radius_km:
-            ids.append(cs.pk)
+    Returns:
+        (M, N) array of distances in kilometers
+    """
+    origin_lats = np.asarray(origin_lats, dtype=np.float64)[:, np.newaxis]
+    origin_lngs = np.asarray(origin_lngs, dtype=np.float64)[:, np.newaxis]
+    lats = np.asarray(lats, dtype=np.float64)[np.newaxis, :]
+    lngs = np.asarray(lngs, dtype=np.float64)[np.newaxis, :]
+    return _haversine(origin_lats, origin_lngs, lats, lngs)
+
+
+def coordinate_arrays(rows) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert (pk, lat, lng) rows, e.g. from values_list(), into NumPy arrays.
     
-    return base_qs.model.objects.filter(pk__in=ids)
+    Returns:
+        Tuple of (ids, lats, lngs) arrays
+    """
+    data = np.array(list(rows), dtype=np.float64).reshape(-1, 3)
+    return data[:, 0].astype(np.int64), data[:, 1], data[:, 2]
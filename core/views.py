@@ -1,102 +1,130 @@
 import json
+import math
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import HttpResponseForbidden, JsonResponse
-from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.core.exceptions import BadRequest, PermissionDenied
 from django.views.decorators.http import require_POST
-from django.db.models import Count
 from django.urls import reverse
-from .models import Campsite, CampsiteLike, Product
+from accounts.capabilities import aget_capabilities, get_capabilities
+from .models import Campsite, Product
 from .forms import CampsiteForm, ProductForm
-from .utils import upload_campsite_image, upload_product_image, parse_lat_lng, get_campsites_within_radius
+from .utils import upload_campsite_image, upload_product_image, parse_lat_lng
+from .spatial import campsite_index
+from .clustering import cluster_pyramid
+from .pagination import (
+    CAMPSITE_LIST_ORDERING, MODERATION_QUEUE_ORDERING, campsites_submitted_after, encode_campsite_cursor,
+    encode_moderation_cursor,
+)
+from .caching import acached_catalogue, cached_catalogue
+from .facets import facet_countries, pending_count, pending_countries
+from .fragments import acampsite_cards
+from .likes import aliked_campsite_ids
+
+# Campsites rendered server-side before "Load more" takes over
+CAMPSITE_LIST_PAGE_SIZE = 30
+
+# Pending campsites per page of the moderation queues
+MODERATION_PAGE_SIZE = 25
 
 
 def home(request):
     """Render the home page."""
     # Get the last two approved campsites ordered by creation date
     # Staff can see all; others only see approved
-    if request.user.is_authenticated and request.user.is_staff:
-        recent_campsites = Campsite.objects.order_by('-created_at')[:2]
-    else:
-        recent_campsites = Campsite.objects.filter(is_approved=True).order_by('-created_at')[:2]
+    is_staff = request.user.is_authenticated and request.user.is_staff
+
+    def recent():
+        qs = Campsite.objects.all() if is_staff else Campsite.objects.filter(is_approved=True)
+        return list(qs.order_by('-created_at')[:2])
+
+    recent_campsites = cached_catalogue('home-recent', (is_staff,), recent)
     return render(request, 'home.html', {'recent_campsites': recent_campsites})
 
 
 @login_required
-def campsites_list(request):
+async def campsites_list(request):
     """Display list of all campsites with pagination."""
-    from django.core.paginator import Paginator
-    
-    user = request.user
-    
-    # Staff can see all campsites; others only see approved
-    qs = Campsite.objects.all()
-    if not user.is_staff:
-        qs = qs.filter(is_approved=True)
-    
-    # Annotate with like counts and order: premium first, then by like count, then by name
-    qs = qs.annotate(
-        like_count=Count('likes', distinct=True)
-    ).order_by('-is_premium', '-like_count', 'name')
+    # Resolve the user once with the async ORM; templates read request.user
+    user = request.user = await request.auser()
     
-    # Paginate with first 30 items
-    paginator = Paginator(qs, 30)
-    page_obj = paginator.get_page(1)
+    async def first_page():
+        # Staff can see all campsites; others only see approved
+        qs = Campsite.objects.all()
+        if not user.is_staff:
+            qs = qs.filter(is_approved=True)
+
+        # Order: premium first, then by like count, then by name
+        qs = qs.order_by(*CAMPSITE_LIST_ORDERING)
+
+        # First 30 items; Paginator has no async API, so count and slice directly
+        count = await qs.acount()
+        campsites = [campsite async for campsite in qs[:CAMPSITE_LIST_PAGE_SIZE]]
+        total_pages = max(1, math.ceil(count / CAMPSITE_LIST_PAGE_SIZE))
+
+        # Cursor for "Load more" to continue from the last server-rendered card
+        next_cursor = encode_campsite_cursor(campsites[-1]) if total_pages > 1 else None
+
+        return campsites, {
+            'count': count,
+            'current_page': 1,
+            'total_pages': total_pages,
+            'next_page': 2 if total_pages > 1 else None,
+            'next_cursor': next_cursor,
+        }
+
+    # The first page is the same for every user with the same visibility
+    campsites, pagination_meta = await acached_catalogue('campsite-list', (user.is_staff,), first_page)
     
-    # Get current user's liked campsite IDs
-    liked_campsite_ids = set()
-    if user.is_authenticated:
-        liked_campsite_ids = set(
-            CampsiteLike.objects.filter(user=user).values_list('campsite_id', flat=True)
-        )
+    # Which of the campsites on this page the user has liked
+    liked_campsite_ids = await aliked_campsite_ids(user, [campsite.pk for campsite in campsites])
     
     # Can add new campsites if superuser or in CampsiteManager group
-    can_add = user.is_superuser or user.groups.filter(name='CampsiteManager').exists()
+    capabilities = await aget_capabilities(request)
+    
+    # Cards come from cached fragments; only the like state is applied per user
+    campsite_cards = await acampsite_cards(campsites, user, liked_campsite_ids)
     
     return render(request, 'campsites/list.html', {
-        'campsites': page_obj.object_list,
-        'pagination_meta': {
-            'count': paginator.count,
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-            'next_page': 2 if paginator.num_pages > 1 else None,
-        },
+        'campsite_cards': campsite_cards,
+        'pagination_meta': pagination_meta,
         'initial_filters': {
             'country': request.GET.get('country', ''),
             'search': request.GET.get('search', ''),
         },
-        'can_modify': can_add,
-        'liked_campsite_ids': liked_campsite_ids
+        'can_modify': capabilities.can_add_campsites,
     })
 
 
 @login_required
-def campsite_detail(request, pk):
+async def campsite_detail(request, pk):
     """Display details of a specific campsite."""
-    campsite = get_object_or_404(
-        Campsite.objects.annotate(like_count=Count('likes')),
-        pk=pk
-    )
+    user = request.user = await request.auser()
+
+    async def load():
+        # Unknown ids are cached as False so repeated 404s skip the query too
+        return await Campsite.objects.filter(pk=pk).afirst() or False
+
+    campsite = await acached_catalogue('campsite-detail', (pk,), load)
+    if not campsite:
+        raise Http404("No Campsite matches the given query.")
     
     # Check if user can view: approved, staff, or the suggester themselves
     if not campsite.is_approved:
-        if not (request.user.is_staff or campsite.suggested_by == request.user):
+        if not (user.is_staff or campsite.suggested_by_id == user.pk):
             raise PermissionDenied("You don't have permission to view this campsite.")
     
-    # Get current user's liked campsite IDs
-    liked_campsite_ids = set()
-    if request.user.is_authenticated:
-        liked_campsite_ids = set(
-            CampsiteLike.objects.filter(user=request.user).values_list('campsite_id', flat=True)
-        )
+    # Whether the user has liked this campsite, as a set for the template's membership test
+    liked_campsite_ids = await aliked_campsite_ids(user, [campsite.pk])
     
     # Check if user can edit/delete: superuser can modify any, CampsiteManager can only modify their own
-    can_modify = request.user.is_superuser or (request.user.groups.filter(name='CampsiteManager').exists() and campsite.created_by == request.user)
+    capabilities = await aget_capabilities(request)
     return render(request, 'campsites/detail.html', {
         'campsite': campsite,
-        'can_modify': can_modify,
+        'can_modify': capabilities.can_modify_campsite(campsite),
         'liked_campsite_ids': liked_campsite_ids
     })
 
@@ -105,7 +133,7 @@ def campsite_detail(request, pk):
 def campsite_create(request):
     """Create a new campsite (superusers and CampsiteManager group only)."""
     # Check permissions
-    if not (request.user.is_superuser or request.user.groups.filter(name='CampsiteManager').exists()):
+    if not get_capabilities(request).can_add_campsites:
         return HttpResponseForbidden("You don't have permission to create campsites.")
     
     if request.method == 'POST':
@@ -137,9 +165,8 @@ def campsite_edit(request, pk):
     campsite = get_object_or_404(Campsite, pk=pk)
     
     # Check permissions: superuser can edit any, CampsiteManager can only edit their own
-    if not request.user.is_superuser:
-        if not (request.user.groups.filter(name='CampsiteManager').exists() and campsite.created_by == request.user):
-            return HttpResponseForbidden("You don't have permission to edit this campsite.")
+    if not get_capabilities(request).can_modify_campsite(campsite):
+        return HttpResponseForbidden("You don't have permission to edit this campsite.")
     
     if request.method == 'POST':
         form = CampsiteForm(request.POST, request.FILES, instance=campsite)
@@ -169,9 +196,8 @@ def campsite_delete(request, pk):
     campsite = get_object_or_404(Campsite, pk=pk)
     
     # Check permissions: superuser can delete any, CampsiteManager can only delete their own
-    if not request.user.is_superuser:
-        if not (request.user.groups.filter(name='CampsiteManager').exists() and campsite.created_by == request.user):
-            return HttpResponseForbidden("You don't have permission to delete this campsite.")
+    if not get_capabilities(request).can_modify_campsite(campsite):
+        return HttpResponseForbidden("You don't have permission to delete this campsite.")
     
     if request.method == 'POST':
         campsite_name = campsite.name
@@ -225,7 +251,7 @@ def my_suggestions(request):
     liked_campsites = Campsite.objects.filter(
         likes__user=request.user,
         is_approved=True
-    ).annotate(like_count=Count('likes')).order_by('-likes__created_at')
+    ).order_by('-likes__created_at')
     
     return render(request, 'campsites/my_suggestions.html', {
         'suggestions': suggestions,
@@ -233,19 +259,70 @@ def my_suggestions(request):
     })
 
 
+def _moderation_queue(request, newest_first=False):
+    """
+    One page of pending campsites for the moderation pages.
+
+    ?country= and ?suggester= (a username) narrow the queue, and ?after=
+    continues from a cursor. The pending count comes from the facet table
+    rather than a COUNT over campsites, except for a single suggester's
+    queue, which the suggester index keeps small.
+    """
+    country = request.GET.get('country', '').strip().upper()
+    suggester = request.GET.get('suggester', '').strip()
+    cursor = request.GET.get('after')
+
+    qs = Campsite.objects.filter(is_approved=False).select_related('suggested_by')
+    if country:
+        qs = qs.filter(country=country)
+    if suggester:
+        suggester_id = get_user_model().objects.filter(username=suggester).values_list('pk', flat=True).first()
+        # An unknown username matches nothing, rather than the campsites without a suggester
+        qs = qs.filter(suggested_by_id=suggester_id) if suggester_id else qs.none()
+        pending = qs.count()
+    else:
+        pending = cached_catalogue('pending-count', (country,), lambda: pending_count(country))
+
+    ordering = [f'-{field}' for field in MODERATION_QUEUE_ORDERING] if newest_first else MODERATION_QUEUE_ORDERING
+    qs = qs.order_by(*ordering)
+    if cursor:
+        try:
+            qs = campsites_submitted_after(qs, cursor, newest_first=newest_first)
+        except ValueError as e:
+            raise BadRequest(str(e))
+
+    # One extra row tells whether there is a next page
+    campsites = list(qs[:MODERATION_PAGE_SIZE + 1])
+    next_url = None
+    if len(campsites) > MODERATION_PAGE_SIZE:
+        campsites = campsites[:MODERATION_PAGE_SIZE]
+        params = request.GET.copy()
+        params['after'] = encode_moderation_cursor(campsites[-1])
+        next_url = f'?{params.urlencode()}'
+
+    country_names = dict(Campsite.COUNTRY_CHOICES)
+    return {
+        'campsites': campsites,
+        'pending_count': pending,
+        'next_url': next_url,
+        'is_first_page': not cursor,
+        'filters': {'country': country, 'suggester': suggester},
+        'countries': [(code, country_names.get(code, code)) for code in pending_countries()],
+    }
+
+
 @staff_member_required
 def pending_campsites(request):
-    """Display pending campsite suggestions (staff only)."""
-    pending = Campsite.objects.filter(is_approved=False).select_related('suggested_by').order_by('created_at')
-    return render(request, 'campsites/pending.html', {'pending_campsites': pending})
+    """Display pending campsite suggestions, oldest first (staff only)."""
+    queue = _moderation_queue(request)
+    return render(request, 'campsites/pending.html', {'pending_campsites': queue.pop('campsites'), **queue})
 
 
 @staff_member_required
 def admin_manage_suggestions(request):
     """Admin page to manage pending campsite suggestions with toggle approval."""
-    # Get only pending (unapproved) campsites ordered by creation date
-    campsites = Campsite.objects.filter(is_approved=False).select_related('suggested_by').order_by('-created_at')
-    return render(request, 'campsites/admin_manage.html', {'campsites': campsites})
+    # Newest suggestions first, so a burst of spam is at the top
+    return render(request, 'campsites/admin_manage.html', _moderation_queue(request, newest_first=True))
 
 
 @staff_member_required
@@ -274,66 +351,43 @@ def campsites_map(request):
     if not request.user.is_staff:
         base_qs = base_qs.filter(is_approved=True)
 
-    # Annotate like counts
-    base_qs = base_qs.annotate(like_count=Count("likes", distinct=True))
-
-    # Get distinct countries for dropdown
-    countries = (
-        base_qs.exclude(country__isnull=True)
-               .exclude(country__exact="")
-               .values_list("country", flat=True)
-               .distinct()
-               .order_by("country")
-    )
+    # Countries for the dropdown, read from the facet table rather than the campsites
+    countries = facet_countries(approved_only=not request.user.is_staff)
 
+    # Markers are not embedded in the page: the browser loads them per viewport
+    # from the map data API, so only totals and the initial extent are computed here.
     mode = "country"
     radius_km = 100
     center_campsite = None
-    campsites_qs = base_qs
+    count = 0
+    bounds = None
+    center_lat, center_lng = 54.5260, 15.2551  # Europe fallback
 
-    # Determine mode and filter campsites
     if campsite_id_param:
         mode = "radius"
         center_campsite = get_object_or_404(base_qs, pk=campsite_id_param)
-        campsites_qs = get_campsites_within_radius(center_campsite, radius_km, base_qs)
-        # Re-apply like count annotation after radius filtering
-        campsites_qs = campsites_qs.annotate(like_count=Count("likes", distinct=True))
-    elif country_param:
-        mode = "country"
-        campsites_qs = base_qs.filter(country__iexact=country_param)
+        center = parse_lat_lng(center_campsite)
+        if center:
+            center_lat, center_lng = center
+            count = len(campsite_index.within_radius(
+                center_lat, center_lng, radius_km, approved_only=not request.user.is_staff
+            ))
     else:
-        mode = "country"
-
-    # Prepare marker data; skip invalid coords
-    campsite_points = []
-    for cs in campsites_qs:
-        coords = parse_lat_lng(cs)
-        if not coords:
-            continue
-        lat, lng = coords
-        campsite_points.append({
-            "id": cs.pk,
-            "name": cs.name,
-            "country": cs.get_country_display() if hasattr(cs, 'get_country_display') else cs.country,
-            "lat": lat,
-            "lng": lng,
-            "likes": cs.like_count,
-            "url": reverse("campsite_detail", args=[cs.pk]),
-        })
-
-    # Determine map center
-    center_lat, center_lng = 54.5260, 15.2551  # Europe fallback
-    if mode == "radius" and center_campsite:
-        c = parse_lat_lng(center_campsite)
-        if c:
-            center_lat, center_lng = c
-    elif campsite_points:
-        # Calculate centroid of available points
-        center_lat = sum(p["lat"] for p in campsite_points) / len(campsite_points)
-        center_lng = sum(p["lng"] for p in campsite_points) / len(campsite_points)
+        # The coarsest cluster level gives the totals and extent for the initial view
+        overview = cluster_pyramid.get_level(
+            0, approved_only=not request.user.is_staff, country=country_param
+        )
+        if overview:
+            count = sum(cl["count"] for cl in overview)
+            # Calculate centroid of the clustered points
+            center_lat = sum(cl["lat"] * cl["count"] for cl in overview) / count
+            center_lng = sum(cl["lng"] * cl["count"] for cl in overview) / count
+            bounds = [
+                [min(cl["bounds"][0] for cl in overview), min(cl["bounds"][1] for cl in overview)],
+                [max(cl["bounds"][2] for cl in overview), max(cl["bounds"][3] for cl in overview)],
+            ]
 
     # Build title and back URL
-    count = len(campsite_points)
     if mode == "radius" and center_campsite:
         title = f"Campsites within {radius_km} km of {center_campsite.name}"
         back_url = reverse("campsite_detail", args=[center_campsite.pk])
@@ -356,7 +410,8 @@ def campsites_map(request):
             if center_campsite else None
         ),
         "selectedCountry": country_param,
-        "campsites": campsite_points,
+        "bounds": bounds,
+        "dataUrl": reverse("api:campsite-map"),
         "tile": {
             "url": "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
             "attribution": "&copy; <a href='https://www.openstreetmap.org/copyright'>OpenStreetMap</a> contributors"
@@ -383,7 +438,7 @@ def products_list(request):
     products = Product.objects.filter(is_featured=True).order_by('name')
     
     # Check if user is super admin
-    can_modify = request.user.is_super_admin or request.user.is_superuser
+    can_modify = get_capabilities(request).can_manage_products
     
     return render(request, 'products/list.html', {
         'products': products,
@@ -397,7 +452,7 @@ def product_detail(request, pk):
     product = get_object_or_404(Product, pk=pk)
     
     # Check if user can modify (super admin only)
-    can_modify = request.user.is_super_admin or request.user.is_superuser
+    can_modify = get_capabilities(request).can_manage_products
     
     return render(request, 'products/detail.html', {
         'product': product,
@@ -409,7 +464,7 @@ def product_detail(request, pk):
 def product_create(request):
     """Create a new product (super admins only)."""
     # Check permissions
-    if not (request.user.is_super_admin or request.user.is_superuser):
+    if not get_capabilities(request).can_manage_products:
         return HttpResponseForbidden("You don't have permission to create products.")
     
     if request.method == 'POST':
@@ -441,7 +496,7 @@ def product_edit(request, pk):
     product = get_object_or_404(Product, pk=pk)
     
     # Check permissions
-    if not (request.user.is_super_admin or request.user.is_superuser):
+    if not get_capabilities(request).can_manage_products:
         return HttpResponseForbidden("You don't have permission to edit products.")
     
     if request.method == 'POST':
@@ -472,7 +527,7 @@ def product_delete(request, pk):
     product = get_object_or_404(Product, pk=pk)
     
     # Check permissions
-    if not (request.user.is_super_admin or request.user.is_superuser):
+    if not get_capabilities(request).can_manage_products:
         return HttpResponseForbidden("You don't have permission to delete products.")
     
     if request.method == 'POST':
@@ -1,11 +1,13 @@
 // static/js/campsite-pagination.js
 // Handles AJAX pagination for campsites list with "Load More" and numbered pagination
+// "Load More" uses keyset cursors (no page offset or total count); numbered links use page numbers
 
 (function () {
   const state = {
     endpoint: '/api/campsites/',
     currentPage: 1,
     totalPages: 1,
+    nextCursor: '',
     country: '',
     search: '',
     isLoading: false,
@@ -28,6 +30,7 @@
     state.endpoint = els.wrap.dataset.endpoint || state.endpoint;
     state.currentPage = parseInt(els.wrap.dataset.currentPage || '1', 10);
     state.totalPages = parseInt(els.wrap.dataset.totalPages || '1', 10);
+    state.nextCursor = els.wrap.dataset.nextCursor || '';
     state.country = els.wrap.dataset.initialCountry || '';
     state.search = els.wrap.dataset.initialSearch || '';
 
@@ -42,9 +45,8 @@
     if (els.loadMore) {
       els.loadMore.addEventListener('click', () => {
         if (state.isLoading) return;
-        const next = state.currentPage + 1;
-        if (next <= state.totalPages) {
-          fetchPage(next, { append: true });
+        if (state.nextCursor) {
+          fetchPage(state.currentPage + 1, { append: true, cursor: state.nextCursor });
         }
       });
     }
@@ -62,25 +64,31 @@
     state.search = (search || '').trim();
   }
 
-  function buildQuery(page) {
+  function buildQuery(page, cursor) {
     const params = new URLSearchParams();
-    params.set('page', String(page));
+    if (cursor) {
+      params.set('cursor', cursor);
+    } else {
+      params.set('page', String(page));
+    }
     if (state.country && state.country !== 'all') params.set('country', state.country);
     if (state.search) params.set('search', state.search);
     return `${state.endpoint}?${params.toString()}`;
   }
 
-  async function fetchPage(page, { append = false, replace = false } = {}) {
+  async function fetchPage(page, { append = false, replace = false, cursor = '' } = {}) {
     try {
       setLoading(true);
-      const url = buildQuery(page);
+      const url = buildQuery(page, cursor);
       const res = await fetch(url, { credentials: 'same-origin' });
       
       if (!res.ok) throw new Error(`Failed to load: ${res.status}`);
       
       const data = await res.json();
+      // Cursor pages have the same size as numbered ones, so page numbering stays in step
       state.currentPage = data.current_page || page;
-      state.totalPages = data.total_pages || state.totalPages;
+      state.totalPages = data.total_pages || Math.max(state.totalPages, state.currentPage);
+      state.nextCursor = data.next_cursor || '';
 
       const cards = data.results.map(renderCardHTML).join('');
 
@@ -93,7 +101,7 @@
         if (els.gridAppend) els.gridAppend.insertAdjacentHTML('beforeend', cards);
       }
 
-      updateTotalCount(data.count);
+      if (data.count != null) updateTotalCount(data.count);
       renderPagination();
       updateLoadMoreState();
 
@@ -296,7 +304,7 @@
   function updateLoadMoreState() {
     if (!els.loadMore) return;
     
-    const hasMore = state.currentPage < state.totalPages;
+    const hasMore = Boolean(state.nextCursor);
     els.loadMore.disabled = !hasMore || state.isLoading;
   }
 
@@ -318,7 +326,7 @@
         spinner.classList.toggle('hidden', !isLoading);
       }
       
-      els.loadMore.disabled = isLoading || state.currentPage >= state.totalPages;
+      els.loadMore.disabled = isLoading || !state.nextCursor;
     }
   }
 
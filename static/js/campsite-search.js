@@ -2,7 +2,9 @@
 // Handles search and filtering integration with pagination API
 
 (function () {
+  const FACETS_URL = '/api/campsites/facets/';
   let debounceTimer;
+  let facetsRequest = 0;
 
   function init() {
     const countrySelect = document.getElementById('countryFilter');
@@ -25,6 +27,40 @@
         }
       });
     }
+
+    refreshCountryCounts();
+  }
+
+  // Show how many campsites each country would list for the current search
+  async function refreshCountryCounts() {
+    const countrySelect = document.getElementById('countryFilter');
+    if (!countrySelect) return;
+
+    const searchInput = document.getElementById('campsiteSearch');
+    const search = searchInput ? (searchInput.value || '').trim() : '';
+    const params = new URLSearchParams();
+    if (search) params.set('search', search);
+
+    const request = ++facetsRequest;
+    let data;
+    try {
+      const resp = await fetch(FACETS_URL + '?' + params.toString(), { credentials: 'same-origin' });
+      if (!resp.ok) return;
+      data = await resp.json();
+    } catch (err) {
+      return;
+    }
+    // A newer search has been typed in the meantime
+    if (request !== facetsRequest) return;
+
+    const counts = {};
+    (data.facets.country || []).forEach(item => { counts[item.value] = item.count; });
+
+    Array.from(countrySelect.options).forEach(option => {
+      if (option.value === 'all') return;
+      if (!option.dataset.label) option.dataset.label = option.textContent;
+      option.textContent = `${option.dataset.label} (${counts[option.value] || 0})`;
+    });
   }
 
   function onFiltersChanged() {
@@ -39,6 +75,8 @@
       detail: { country, search }
     });
     document.dispatchEvent(event);
+
+    refreshCountryCounts();
   }
 
   // Initialize on DOM ready
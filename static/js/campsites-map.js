@@ -1,5 +1,6 @@
 // Campsites map initializer using Leaflet and OpenStreetMap
 // Supports two modes: country view (all campsites in a country) and radius view (100km radius)
+// Markers are loaded per viewport from the map data API as the user pans and zooms
 
 (function () {
   const dataEl = document.getElementById("map-data");
@@ -25,10 +26,11 @@
     maxZoom: 19 
   }).addTo(map);
 
-  // Optional marker clustering if plugin is available
-  const group = (typeof L.markerClusterGroup !== 'undefined') 
-    ? L.markerClusterGroup() 
-    : L.featureGroup();
+  // Markers and server-side clusters are kept in separate layers: markers
+  // persist across pans at the same zoom, clusters are redrawn every time
+  const markerLayer = L.featureGroup().addTo(map);
+  const clusterLayer = L.featureGroup().addTo(map);
+  const markersById = new Map();
 
   // Custom icons for center campsite (radius mode)
   const defaultIcon = new L.Icon.Default();
@@ -46,37 +48,109 @@
 
   const centerId = config.centerCampsite?.id || null;
 
-  // Add markers for each campsite
-  (config.campsites || []).forEach((c) => {
-    if (typeof c.lat !== "number" || typeof c.lng !== "number") return;
+  // Detail URL for campsite 0, rendered by the template; the id is swapped in per marker
+  const detailUrlPattern = document.getElementById("campsites-map").dataset.detailUrl || "";
+  const detailUrl = (id) => detailUrlPattern.replace(/\/0\/$/, `/${id}/`);
 
-    const isCenter = centerId && c.id === centerId && config.mode === "radius";
-    const marker = L.marker([c.lat, c.lng], { 
-      icon: isCenter ? createCenterIcon() : defaultIcon 
-    });
+  const escapeHtml = (str) => String(str ?? "").replace(/[&<>"']/g, (m) => ({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+  }[m]));
 
-    // Popup content
-    const popupHtml = `
+  const buildPopupHtml = (c, isCenter) => `
       <div class="p-2">
-        <div class="font-semibold text-base mb-1">${c.name}${isCenter ? ' <span class="text-xs text-red-600">(Center)</span>' : ''}</div>
-        ${c.country ? `<div class="text-xs text-gray-600 mb-1"><svg class="w-3 h-3 inline mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"></path></svg>${c.country}</div>` : ""}
+        <div class="font-semibold text-base mb-1">${escapeHtml(c.name)}${isCenter ? ' <span class="text-xs text-red-600">(Center)</span>' : ''}</div>
+        ${c.country ? `<div class="text-xs text-gray-600 mb-1"><svg class="w-3 h-3 inline mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"></path></svg>${escapeHtml(c.country)}</div>` : ""}
         <div class="text-xs text-gray-600 mb-2"><svg class="w-3 h-3 inline mr-1" fill="currentColor" viewBox="0 0 20 20"><path d="M3.172 5.172a4 4 0 015.656 0L10 6.343l1.172-1.171a4 4 0 115.656 5.656L10 17.657l-6.828-6.829a4 4 0 010-5.656z"></path></svg>Likes: ${c.likes || 0}</div>
-        ${c.url ? `<a class="text-xs text-green-600 hover:text-green-700 font-medium hover:underline" href="${c.url}">View Details →</a>` : ""}
+        <a class="text-xs text-green-600 hover:text-green-700 font-medium hover:underline" href="${escapeHtml(detailUrl(c.id))}">View Details →</a>
       </div>
     `;
-    
-    marker.bindPopup(popupHtml, { 
+
+  const buildMarker = (c) => {
+    const isCenter = centerId && c.id === centerId && config.mode === "radius";
+    const marker = L.marker([c.lat, c.lng], { 
+      icon: isCenter ? createCenterIcon() : defaultIcon 
+    });
+    marker.bindPopup(buildPopupHtml(c, isCenter), { 
       closeButton: true,
       maxWidth: 250 
     });
-    group.addLayer(marker);
-  });
+    return marker;
+  };
 
-  group.addTo(map);
+  // Server-side clusters: a count bubble that zooms into its bounds on click
+  const buildClusterMarker = (count, lat, lng, clusterBounds) => {
+    const size = count < 10 ? 30 : count < 100 ? 38 : count < 1000 ? 46 : 54;
+    const icon = L.divIcon({
+      className: 'campsite-cluster-marker',
+      html: `<div style="width: ${size}px; height: ${size}px; line-height: ${size}px; border-radius: 50%; background-color: rgba(22, 163, 74, 0.85); color: #fff; font-weight: 600; font-size: 13px; text-align: center; border: 3px solid #fff; box-shadow: 0 2px 6px rgba(0,0,0,0.3);">${count}</div>`,
+      iconSize: [size, size],
+      iconAnchor: [size / 2, size / 2],
+    });
+    const marker = L.marker([lat, lng], { icon });
+    marker.on("click", () => {
+      const [minLat, minLng, maxLat, maxLng] = clusterBounds;
+      map.fitBounds([[minLat, minLng], [maxLat, maxLng]], { padding: [30, 30] });
+    });
+    return marker;
+  };
+
+  // Load the markers (and clusters) for the current viewport from the map data API
+  let requestSeq = 0;
+  let loadedZoom = null;
+  const loadViewport = async () => {
+    const requestId = ++requestSeq;
+    const zoom = map.getZoom();
+    const b = map.getBounds();
+    const params = new URLSearchParams({
+      bbox: [b.getWest(), b.getSouth(), b.getEast(), b.getNorth()].map((v) => v.toFixed(5)).join(","),
+    });
+    if (config.mode === "radius" && centerId) {
+      params.set("campsite_id", String(centerId));
+      params.set("radius_km", String(config.radius_km));
+    } else {
+      params.set("zoom", String(zoom));
+      if (config.selectedCountry) params.set("country", config.selectedCountry);
+    }
+
+    try {
+      const res = await fetch(`${config.dataUrl}?${params.toString()}`, { credentials: "same-origin" });
+      if (!res.ok) throw new Error(`Failed to load map data: ${res.status}`);
+      const data = await res.json();
+      if (requestId !== requestSeq) return; // A newer pan/zoom superseded this one
+
+      // Markers only stay valid across pans at the same zoom, since clustering changes with zoom
+      if (loadedZoom !== zoom && config.mode !== "radius") {
+        markerLayer.clearLayers();
+        markersById.clear();
+      }
+      loadedZoom = zoom;
+
+      const m = data.markers;
+      for (let i = 0; i < m.id.length; i++) {
+        if (markersById.has(m.id[i])) continue;
+        const marker = buildMarker({ id: m.id[i], name: m.name[i], country: m.country[i], lat: m.lat[i], lng: m.lng[i], likes: m.likes[i] });
+        markersById.set(m.id[i], marker);
+        markerLayer.addLayer(marker);
+      }
+
+      clusterLayer.clearLayers();
+      const cl = data.clusters;
+      for (let i = 0; i < cl.count.length; i++) {
+        clusterLayer.addLayer(buildClusterMarker(cl.count[i], cl.lat[i], cl.lng[i], cl.bounds[i]));
+      }
+    } catch (err) {
+      console.error("Map data error:", err);
+    }
+  };
 
   // Optional: Add radius circle for radius mode
+  let radiusCircle = null;
   if (config.mode === "radius" && config.center && config.radius_km) {
-    L.circle([config.center.lat, config.center.lng], {
+    radiusCircle = L.circle([config.center.lat, config.center.lng], {
       radius: config.radius_km * 1000, // Convert km to meters
       color: "#ef4444",
       fillColor: "#ef4444",
@@ -86,14 +160,18 @@
     }).addTo(map);
   }
 
-  // Fit bounds if we have markers; fallback to provided center
-  const bounds = group.getBounds();
-  if (bounds.isValid()) {
-    map.fitBounds(bounds, { padding: [30, 30], maxZoom: 13 });
+  // Initial view: the radius circle, the server-provided extent, or the fallback center
+  if (radiusCircle) {
+    map.fitBounds(radiusCircle.getBounds(), { padding: [30, 30] });
+  } else if (config.bounds) {
+    map.fitBounds(config.bounds, { padding: [30, 30], maxZoom: 13 });
   } else if (config.center) {
-    map.setView([config.center.lat, config.center.lng], config.mode === "radius" ? 10 : 6);
+    map.setView([config.center.lat, config.center.lng], 6);
   }
 
+  map.on("moveend", loadViewport);
+  loadViewport();
+
   // Country dropdown handler (Scenario A)
   const countrySelect = document.getElementById("countrySelect");
   if (countrySelect) {
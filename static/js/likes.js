@@ -35,6 +35,37 @@ function updateLikeUI(btn, isLiked, likeCount) {
   if (countEl) countEl.textContent = String(likeCount);
 }
 
+const LIKE_STATUS_URL = '/api/campsites/likes/status/';
+const LIKE_STATUS_BATCH = 500;
+
+// Refresh every like button under root from one bulk status request per batch
+async function hydrateLikes(root = document) {
+  const buttons = Array.from(root.querySelectorAll('.like-btn[data-campsite-id]'));
+  const ids = Array.from(new Set(buttons.map((btn) => btn.dataset.campsiteId)));
+
+  for (let i = 0; i < ids.length; i += LIKE_STATUS_BATCH) {
+    const batch = ids.slice(i, i + LIKE_STATUS_BATCH);
+    const resp = await fetch(LIKE_STATUS_URL + '?ids=' + batch.join(','), { credentials: 'same-origin' });
+    if (!resp.ok) {
+      throw new Error('Failed to load like status, status ' + resp.status);
+    }
+
+    const statuses = await resp.json();
+    for (const btn of buttons) {
+      const entry = statuses[btn.dataset.campsiteId];
+      if (entry) updateLikeUI(btn, Boolean(entry.is_liked), Number(entry.like_count));
+    }
+  }
+}
+
+window.hydrateLikes = hydrateLikes;
+
+// Pages restored from the back/forward cache show the like state from when
+// they were left, so bring them up to date
+window.addEventListener('pageshow', (e) => {
+  if (e.persisted) hydrateLikes().catch((err) => console.error(err));
+});
+
 async function toggleLike(btn) {
   const url = btn.dataset.likeUrl;
   if (!url) return;